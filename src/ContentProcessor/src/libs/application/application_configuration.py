@@ -31,6 +31,7 @@ class AppConfiguration(ModelBaseSettings):
         app_cosmos_database (str): The name of the Cosmos DB database.
         app_cosmos_container_process (str): The name of the Cosmos DB container for process data.
         app_cosmos_container_schema (str): The name of the Cosmos DB container for schema data.
+        app_schema_code_cache_dir (str, optional): Directory for compiled schema code kept across restarts. Defaults to ~/.cps_cache.
     """
 
     app_storage_queue_url: str
@@ -50,6 +51,7 @@ class AppConfiguration(ModelBaseSettings):
     app_cosmos_database: str
     app_cosmos_container_process: str
     app_cosmos_container_schema: str
+    app_schema_code_cache_dir: str | None = None
 
     @field_validator("app_process_steps", mode="before")
     @classmethod
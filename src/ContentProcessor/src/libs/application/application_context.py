@@ -14,9 +14,13 @@ class AppContext(AppModelBase):
 
     configuration: AppConfiguration = None
     credential: Any = None  # Azure credential object
+    content_understanding_helper: Any = None  # Shared AzureContentUnderstandingHelper
 
     def set_configuration(self, configuration: AppConfiguration):
         self.configuration = configuration
 
     def set_credential(self, credential: Any):
         self.credential = credential
+
+    def set_content_understanding_helper(self, content_understanding_helper: Any):
+        self.content_understanding_helper = content_understanding_helper
@@ -1,25 +1,30 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import asyncio
 import json
 import logging
 import time
 from pathlib import Path
+from typing import Iterable
 
 import requests
 from helpers.azure_credential_utils import get_azure_credential
+from requests.adapters import HTTPAdapter
 from requests.models import Response
 
 COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+# Refresh the access token this many seconds before it expires
+TOKEN_REFRESH_MARGIN_SECONDS = 300
 
 
 class AzureContentUnderstandingHelper:
-
     def __init__(
         self,
         endpoint: str,
         api_version: str = "2024-12-01-preview",
         x_ms_useragent: str = "cps-contentunderstanding/client",
+        pool_maxsize: int = 32,
     ):
         self.credential = get_azure_credential()
 
@@ -31,11 +36,26 @@ class AzureContentUnderstandingHelper:
         self._endpoint = endpoint.rstrip("/")
         self._api_version = api_version
         self._logger = logging.getLogger(__name__)
-        self._headers = self._get_headers(
-            self.credential.get_token(COGNITIVE_SERVICES_SCOPE).token,
-            x_ms_useragent,
+        self._x_ms_useragent = x_ms_useragent
+        self._access_token = None
+
+        # Shared session so connections to the service are pooled and reused across calls
+        self._session = requests.Session()
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
         )
 
+    @property
+    def _headers(self) -> dict:
+        # The helper is long-lived, so fetch the token lazily and renew it before it expires
+        if (
+            self._access_token is None
+            or self._access_token.expires_on - TOKEN_REFRESH_MARGIN_SECONDS
+            < time.time()
+        ):
+            self._access_token = self.credential.get_token(COGNITIVE_SERVICES_SCOPE)
+        return self._get_headers(self._access_token.token, self._x_ms_useragent)
+
     def _get_analyzer_url(self, endpoint, api_version, analyzer_id):
         return f"{endpoint}/contentunderstanding/analyzers/{analyzer_id}?api-version={api_version}"  # noqa
 
@@ -80,7 +100,7 @@ class AzureContentUnderstandingHelper:
         Raises:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        response = requests.get(
+        response = self._session.get(
             url=self._get_analyzer_list_url(self._endpoint, self._api_version),
             headers=self._headers,
         )
@@ -101,7 +121,7 @@ class AzureContentUnderstandingHelper:
         Raises:
             HTTPError: If the request fails.
         """
-        response = requests.get(
+        response = self._session.get(
             url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
             headers=self._headers,
         )
@@ -152,7 +172,7 @@ class AzureContentUnderstandingHelper:
         headers = {"Content-Type": "application/json"}
         headers.update(self._headers)
 
-        response = requests.put(
+        response = self._session.put(
             url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
             headers=headers,
             json=analyzer_template,
@@ -174,7 +194,7 @@ class AzureContentUnderstandingHelper:
         Raises:
             HTTPError: If the delete request fails.
         """
-        response = requests.delete(
+        response = self._session.delete(
             url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
             headers=self._headers,
         )
@@ -182,13 +202,16 @@ class AzureContentUnderstandingHelper:
         self._logger.info(f"Analyzer {analyzer_id} deleted.")
         return response
 
-    def begin_analyze_stream(self, analyzer_id: str, file_stream: bytes):
+    def begin_analyze_stream(
+        self, analyzer_id: str, file_stream: bytes | Iterable[bytes]
+    ):
         """
         Begins the analysis of a file or URL using the specified analyzer.
 
         Args:
             analyzer_id (str): The ID of the analyzer to use.
-            file_stream (bytes): The byte stream of the file to analyze.
+            file_stream (bytes | Iterable[bytes]): The byte stream of the file to analyze.
+                An iterable of chunks is uploaded with chunked transfer encoding.
 
         Returns:
             Response: The response from the analysis request.
@@ -199,7 +222,7 @@ class AzureContentUnderstandingHelper:
         """
         headers = {"Content-Type": "application/octet-stream"}
         headers.update(self._headers)
-        response = requests.post(
+        response = self._session.post(
             url=self._get_analyze_url(self._endpoint, self._api_version, analyzer_id),
             headers=headers,
             data=file_stream,
@@ -237,7 +260,7 @@ class AzureContentUnderstandingHelper:
 
         headers.update(self._headers)
         if isinstance(data, dict):
-            response = requests.post(
+            response = self._session.post(
                 url=self._get_analyze_url(
                     self._endpoint, self._api_version, analyzer_id
                 ),
@@ -245,7 +268,7 @@ class AzureContentUnderstandingHelper:
                 json=data,
             )
         else:
-            response = requests.post(
+            response = self._session.post(
                 url=self._get_analyze_url(
                     self._endpoint, self._api_version, analyzer_id
                 ),
@@ -279,29 +302,48 @@ class AzureContentUnderstandingHelper:
             f"{operation_location}/images/{image_id}?api-version={self._api_version}"
         )
         try:
-            response = requests.get(url=image_retrieval_url, headers=self._headers)
+            response = self._session.get(url=image_retrieval_url, headers=self._headers)
             response.raise_for_status()
 
             assert response.headers.get("Content-Type") == "image/jpeg"
 
             return response.content
         except requests.exceptions.RequestException as e:
-            print(f"HTTP request failed: {e}")
+            self._logger.error(f"HTTP request failed: {e}")
+            return None
+
+    def _get_retry_after_seconds(self, response: Response) -> float | None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after is None:
+            return None
+        try:
+            return float(retry_after)
+        except ValueError:
             return None
 
-    def poll_result(
+    def _get_operation_status(self, operation_location: str) -> Response:
+        # Headers are built here, in the worker thread, as renewing the token is a blocking call
+        return self._session.get(operation_location, headers=self._headers)
+
+    async def poll_result(
         self,
         response: Response,
         timeout_seconds: int = 120,
         polling_interval_seconds: int = 2,
+        max_polling_interval_seconds: int = 16,
     ):
         """
         Polls the result of an asynchronous operation until it completes or times out.
+        The wait between attempts doubles from polling_interval_seconds up to
+        max_polling_interval_seconds, unless the service asks for a specific delay with Retry-After.
+        Requests run in the default executor and waiting is done with asyncio.sleep,
+        so other coroutines keep running in the meantime.
 
         Args:
             response (Response): The initial response object containing the operation location.
             timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
-            polling_interval_seconds (int, optional): The number of seconds to wait between polling attempts. Defaults to 2.
+            polling_interval_seconds (int, optional): The initial number of seconds to wait between polling attempts. Defaults to 2.
+            max_polling_interval_seconds (int, optional): The maximum number of seconds to wait between polling attempts. Defaults to 16.
 
         Raises:
             ValueError: If the operation location is not found in the response headers.
@@ -315,10 +357,8 @@ class AzureContentUnderstandingHelper:
         if not operation_location:
             raise ValueError("Operation location not found in response headers.")
 
-        headers = {"Content-Type": "application/json"}
-        headers.update(self._headers)
-
         start_time = time.time()
+        attempt = 0
         while True:
             elapsed_time = time.time() - start_time
             if elapsed_time > timeout_seconds:
@@ -326,19 +366,30 @@ class AzureContentUnderstandingHelper:
                     f"Operation timed out after {timeout_seconds:.2f} seconds."
                 )
 
-            response = requests.get(operation_location, headers=self._headers)
+            response = await asyncio.to_thread(
+                self._get_operation_status, operation_location
+            )
             response.raise_for_status()
-            status = response.json().get("status").lower()
+            result = response.json()
+            status = result.get("status").lower()
             if status == "succeeded":
                 self._logger.info(
                     f"Request result is ready after {elapsed_time:.2f} seconds."
                 )
-                return response.json()
+                return result
             elif status == "failed":
-                self._logger.error(f"Request failed. Reason: {response.json()}")
+                self._logger.error(f"Request failed. Reason: {result}")
                 raise RuntimeError("Request failed.")
             else:
                 self._logger.info(
                     f"Request {operation_location.split('/')[-1].split('?')[0]} in progress ..."
                 )
-            time.sleep(polling_interval_seconds)
+
+            delay = self._get_retry_after_seconds(response)
+            if delay is None:
+                delay = min(
+                    max_polling_interval_seconds,
+                    polling_interval_seconds * 2**attempt,
+                )
+            attempt += 1
+            await asyncio.sleep(delay)
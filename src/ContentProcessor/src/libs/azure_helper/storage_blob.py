@@ -1,11 +1,15 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
-from typing import IO, Union
+from typing import IO, Iterator, Union
 
 from helpers.azure_credential_utils import get_azure_credential
 from azure.storage.blob import BlobServiceClient
 
+# Size of each ranged GET when downloading, including the first one.
+# The SDK default for the first GET (32 MiB) is larger than any source file, which would buffer it whole.
+BLOB_DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
 
 class StorageBlobHelper:
     blob_service_client: BlobServiceClient = None
@@ -17,7 +21,10 @@ class StorageBlobHelper:
     def __init__(self, account_url: str, container_name=None):
         self.credential = get_azure_credential()
         self.blob_service_client = BlobServiceClient(
-            account_url=account_url, credential=self.credential
+            account_url=account_url,
+            credential=self.credential,
+            max_single_get_size=BLOB_DOWNLOAD_CHUNK_SIZE,
+            max_chunk_get_size=BLOB_DOWNLOAD_CHUNK_SIZE,
         )
         self.parent_container_name = container_name
         if container_name:
@@ -86,6 +93,13 @@ class StorageBlobHelper:
         stream = blob_client.download_blob().readall()
         return stream
 
+    def download_chunks(self, container_name: str, blob_name: str) -> Iterator[bytes]:
+        blob_client = self._get_container_client(container_name).get_blob_client(
+            blob_name
+        )
+        # Chunks of BLOB_DOWNLOAD_CHUNK_SIZE are fetched lazily, one GET per chunk
+        return blob_client.download_blob().chunks()
+
     def download_text(self, container_name: str, blob_name: str) -> str:
         blob_client = self._get_container_client(container_name).get_blob_client(
             blob_name
@@ -3,7 +3,7 @@
 
 import datetime
 from enum import Enum
-from typing import Optional
+from typing import Iterator, Optional
 
 from pydantic import Field
 
@@ -74,6 +74,14 @@ class FileDetails(FileDetailBase):
             account_url=account_url, container_name=container_name
         ).download_stream(container_name=self.process_id, blob_name=self.name)
 
+    def download_chunks(self, account_url: str, container_name: str) -> Iterator[bytes]:
+        """
+        Download the file as an iterator of chunks without buffering the whole blob
+        """
+        return StorageBlobHelper(
+            account_url=account_url, container_name=container_name
+        ).download_chunks(container_name=self.process_id, blob_name=self.name)
+
     def download_file(self, account_url: str, container_name: str, file_path: str):
         """
         Download the file locally
@@ -104,3 +112,13 @@ class FileDetails(FileDetailBase):
         ).upload_text(container_name=self.process_id, blob_name=self.name, text=text)
         self.size = len(text)
         self.mime_type = "application/json"
+
+    def upload_json_bytes(self, account_url: str, container_name: str, data: bytes):
+        """
+        Upload the already encoded json bytes to the blob
+        """
+        StorageBlobHelper(
+            account_url=account_url, container_name=container_name
+        ).upload_blob(container_name=self.process_id, blob_name=self.name, data=data)
+        self.size = len(data)
+        self.mime_type = "application/json"
@@ -1,6 +1,7 @@
+import asyncio
 from typing import Any
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from libs.azure_helper.storage_blob import StorageBlobHelper
 from libs.pipeline.entities.pipeline_message_base import PipelineMessageBase
@@ -12,6 +13,24 @@ class StepResult(PipelineMessageBase):
     result: Any = Field(default=None)
     elapsed: str = Field(default=None)
 
+    # Background work (e.g. artifact uploads) started by the handler, not serialized
+    _pending_tasks: list[asyncio.Task] = PrivateAttr(default_factory=list)
+
+    def add_pending_task(self, task: asyncio.Task):
+        self._pending_tasks.append(task)
+        return self
+
+    async def wait_for_pending_tasks(self):
+        """
+        Wait for the background tasks started by the handler.
+        All tasks are awaited, then the first exception is raised if any of them failed.
+        """
+        pending_tasks, self._pending_tasks = self._pending_tasks, []
+        results = await asyncio.gather(*pending_tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
     def save_to_persistent_storage(self, account_url: str, container_name: str):
         if self.process_id is None:
             raise ValueError("Process ID is required to save the result.")
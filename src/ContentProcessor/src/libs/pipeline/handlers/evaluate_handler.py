@@ -2,6 +2,7 @@
 # Licensed under the MIT License.
 
 import json
+import logging
 
 from openai.types.chat.parsed_chat_completion import ParsedChatCompletion
 
@@ -26,12 +27,18 @@ from libs.pipeline.handlers.logics.evaluate_handler.openai_confidence_evaluator
 from libs.pipeline.queue_handler_base import HandlerBase
 
 
+logger = logging.getLogger(__name__)
+
+
 class EvaluateHandler(HandlerBase):
     def __init__(self, appContext: AppContext, step_name: str, **data):
         super().__init__(appContext, step_name, **data)
 
     async def execute(self, context: MessageContext) -> StepResult:
-        print(context.data_pipeline.get_previous_step_result(self.handler_name))
+        logger.debug(
+            "Previous step result: %r",
+            context.data_pipeline.get_previous_step_result(self.handler_name),
+        )
 
         # Get the result from Extract step
         output_file_json_string_from_extract = self.download_output_file_to_json_string(
@@ -40,8 +47,8 @@ class EvaluateHandler(HandlerBase):
         )
 
         # Deserialize the result to AnalyzedResult (Content Understanding)
-        content_understanding_result = AnalyzedResult(
-            **json.loads(output_file_json_string_from_extract)
+        content_understanding_result = AnalyzedResult.model_validate_json(
+            output_file_json_string_from_extract
         )
 
         # Get the result from Map step handler - OpenAI
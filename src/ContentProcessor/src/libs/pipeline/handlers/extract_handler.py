@@ -1,39 +1,61 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import asyncio
+import logging
+
+from pydantic_core import to_json
+
 from libs.application.application_context import AppContext
 from libs.azure_helper.content_understanding import AzureContentUnderstandingHelper
 from libs.azure_helper.model.content_understanding import AnalyzedResult
 from libs.pipeline.entities.pipeline_file import PipelineLogEntry
 from libs.pipeline.entities.pipeline_message_context import MessageContext
 from libs.pipeline.entities.pipeline_step_result import StepResult
-from libs.pipeline.queue_handler_base import HandlerBase
+from libs.pipeline.queue_handler_base import (
+    HANDLER_MAX_CONCURRENT_MESSAGES,
+    HandlerBase,
+)
 
 from libs.pipeline.entities.pipeline_file import ArtifactType
 
 
+logger = logging.getLogger(__name__)
+
+
 class ExtractHandler(HandlerBase):
+    # All blocking calls run in the default executor, so messages can be processed concurrently
+    max_concurrent_messages: int = HANDLER_MAX_CONCURRENT_MESSAGES
+
     def __init__(self, appContext: AppContext, step_name: str, **data):
         super().__init__(appContext, step_name, **data)
 
     async def execute(self, context: MessageContext) -> StepResult:
-        print(context.data_pipeline.get_previous_step_result(self.handler_name))
+        logger.debug(
+            "Previous step result: %r",
+            context.data_pipeline.get_previous_step_result(self.handler_name),
+        )
 
         # Get File then pass it to Content Understanding Service
-        content_understanding_helper = AzureContentUnderstandingHelper(
-            self.application_context.configuration.app_content_understanding_endpoint
+        content_understanding_helper: AzureContentUnderstandingHelper = (
+            self.application_context.content_understanding_helper
+        )
+
+        # Blocking HTTP calls run in the default executor so the event loop stays free
+        file_stream = await asyncio.to_thread(
+            context.data_pipeline.get_source_files()[0].download_chunks,
+            self.application_context.configuration.app_storage_blob_url,
+            self.application_context.configuration.app_cps_processes,
         )
 
-        response = content_understanding_helper.begin_analyze_stream(
+        response = await asyncio.to_thread(
+            content_understanding_helper.begin_analyze_stream,
             analyzer_id="prebuilt-layout",
-            file_stream=context.data_pipeline.get_source_files()[0].download_stream(
-                self.application_context.configuration.app_storage_blob_url,
-                self.application_context.configuration.app_cps_processes,
-            ),
+            file_stream=file_stream,
         )
 
-        response = content_understanding_helper.poll_result(response)
-        result: AnalyzedResult = AnalyzedResult(**response)
+        response = await content_understanding_helper.poll_result(response)
+        result: AnalyzedResult = AnalyzedResult.model_validate(response)
 
         # Save Result as a file
         # Create File Entity to add
@@ -52,11 +74,16 @@ class ExtractHandler(HandlerBase):
             )
         )
 
-        # Upload the result to blob storage
-        result_file.upload_json_text(
-            account_url=self.application_context.configuration.app_storage_blob_url,
-            container_name=self.application_context.configuration.app_cps_processes,
-            text=result.model_dump_json(),
+        # Upload the result to blob storage in background.
+        # HandlerBase waits for it before the pipeline status is saved.
+        upload_task = asyncio.create_task(
+            asyncio.to_thread(
+                result_file.upload_json_bytes,
+                account_url=self.application_context.configuration.app_storage_blob_url,
+                container_name=self.application_context.configuration.app_cps_processes,
+                # Serialize straight to UTF-8 bytes, no intermediate str
+                data=to_json(result),
+            )
         )
 
         return StepResult(
@@ -66,4 +93,4 @@ class ExtractHandler(HandlerBase):
                 "result": "success",
                 "file_name": result_file.name,
             },
-        )
+        ).add_pending_task(upload_task)
@@ -1,39 +1,82 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import asyncio
 import base64
 import io
-import json
+import logging
 
 from pdf2image import convert_from_bytes
+from pydantic import PrivateAttr
 
 from libs.application.application_context import AppContext
 from libs.azure_helper.azure_openai import get_openai_client
 from libs.azure_helper.model.content_understanding import AnalyzedResult
 from libs.pipeline.entities.mime_types import MimeTypes
-from libs.pipeline.entities.pipeline_file import ArtifactType, PipelineLogEntry
+from libs.pipeline.entities.pipeline_file import (
+    ArtifactType,
+    FileDetails,
+    PipelineLogEntry,
+)
 from libs.pipeline.entities.pipeline_message_context import MessageContext
 from libs.pipeline.entities.pipeline_step_result import StepResult
 from libs.pipeline.entities.schema import Schema
-from libs.pipeline.queue_handler_base import HandlerBase
+from libs.pipeline.queue_handler_base import (
+    HANDLER_MAX_CONCURRENT_MESSAGES,
+    HandlerBase,
+)
 from libs.utils.remote_module_loader import load_schema_from_blob
 
 
+logger = logging.getLogger(__name__)
+
+
 class MapHandler(HandlerBase):
+    # All blocking calls run in the default executor, so messages can be processed concurrently
+    max_concurrent_messages: int = HANDLER_MAX_CONCURRENT_MESSAGES
+
+    # Loaded schema classes keyed by schema id, stored as (schema version, class)
+    _response_format_cache: dict[str, tuple[str, type]] = PrivateAttr(
+        default_factory=dict
+    )
+    # Schema resolutions in progress, shared by concurrent messages for the same schema id
+    _response_format_inflight: dict[str, asyncio.Task] = PrivateAttr(
+        default_factory=dict
+    )
+
     def __init__(self, appContext: AppContext, step_name: str, **data):
         super().__init__(appContext, step_name, **data)
 
     async def execute(self, context: MessageContext) -> StepResult:
-        print(context.data_pipeline.get_previous_step_result(self.handler_name))
+        logger.debug(
+            "Previous step result: %r",
+            context.data_pipeline.get_previous_step_result(self.handler_name),
+        )
 
-        # Get Output files from context.data_pipeline in files list where processed by 'extract' and artifact_type is 'extacted_content'
-        output_file_json_string = self.download_output_file_to_json_string(
-            processed_by="extract",
-            artifact_type=ArtifactType.ExtractedContent,
+        source_file = context.data_pipeline.get_source_files()[0]
+
+        # Download the extracted content, the source file (PDF and images only) and resolve the schema concurrently.
+        # They are independent round-trips to Blob Storage and Cosmos DB.
+        (
+            output_file_json_string,
+            source_file_bytes,
+            response_format,
+        ) = await asyncio.gather(
+            # Get Output files from context.data_pipeline in files list where processed by 'extract' and artifact_type is 'extacted_content'
+            asyncio.to_thread(
+                self.download_output_file_to_json_string,
+                processed_by="extract",
+                artifact_type=ArtifactType.ExtractedContent,
+            ),
+            asyncio.to_thread(self._download_source_file_for_prompt, source_file),
+            # Check Schema Information
+            self._resolve_response_format(
+                context.data_pipeline.pipeline_status.schema_id
+            ),
         )
 
         # Deserialize the result to AnalyzedResult
-        previous_result = AnalyzedResult(**json.loads(output_file_json_string))
+        previous_result = AnalyzedResult.model_validate_json(output_file_json_string)
 
         # Get Markdown content string from the previous result
         markdown_string = previous_result.result.contents[0].markdown
@@ -41,50 +84,20 @@ class MapHandler(HandlerBase):
         # Prepare the prompt
         user_content = self._prepare_prompt(markdown_string)
 
-        # Check file type : PDF
-        if context.data_pipeline.get_source_files()[0].mime_type == MimeTypes.Pdf:
-            # Convert PDF to multiple images
-            pdf_bytes = context.data_pipeline.get_source_files()[0].download_stream(
-                self.application_context.configuration.app_storage_blob_url,
-                self.application_context.configuration.app_cps_processes,
+        # Add the source file as images - PDF rendering and encoding are blocking, run in the default executor
+        user_content.extend(
+            await asyncio.to_thread(
+                self._convert_source_file_to_prompt_images,
+                source_file,
+                source_file_bytes,
             )
-
-            pdf_stream = io.BytesIO(pdf_bytes)
-            # Set the position to the beginning of the stream
-            for image in convert_from_bytes(pdf_stream.read()):
-                byteIO = io.BytesIO()
-                image.save(byteIO, format="PNG")
-                user_content.append(
-                    self._convert_image_bytes_to_prompt("image/png", byteIO.getvalue())
-                )
-        # Check file type : Image - JPEG, PNG
-        elif context.data_pipeline.get_source_files()[0].mime_type in [
-            MimeTypes.ImageJpeg,
-            MimeTypes.ImagePng,
-        ]:
-            # Extract Images
-            user_content.append(
-                self._convert_image_bytes_to_prompt(
-                    context.data_pipeline.get_source_files()[0].mime_type,
-                    context.data_pipeline.get_source_files()[0].download_stream(
-                        self.application_context.configuration.app_storage_blob_url,
-                        self.application_context.configuration.app_cps_processes,
-                    ),
-                )
-            )
-
-        # Check Schema Information
-        selected_schema = Schema.get_schema(
-            connection_string=self.application_context.configuration.app_cosmos_connstr,
-            database_name=self.application_context.configuration.app_cosmos_database,
-            collection_name=self.application_context.configuration.app_cosmos_container_schema,
-            schema_id=context.data_pipeline.pipeline_status.schema_id,
         )
 
-        # Invoke GPT with the prompt
-        gpt_response = get_openai_client(
-            self.application_context.configuration.app_azure_openai_endpoint
-        ).beta.chat.completions.parse(
+        # Invoke GPT with the prompt - in a thread, so other messages keep processing meanwhile
+        gpt_response = await asyncio.to_thread(
+            get_openai_client(
+                self.application_context.configuration.app_azure_openai_endpoint
+            ).beta.chat.completions.parse,
             model=self.application_context.configuration.app_azure_openai_model,
             messages=[
                 {
@@ -99,12 +112,7 @@ class MapHandler(HandlerBase):
                 },
                 {"role": "user", "content": user_content},
             ],
-            response_format=load_schema_from_blob(
-                account_url=self.application_context.configuration.app_storage_blob_url,
-                container_name=f"{self.application_context.configuration.app_cps_configuration}/Schemas/{context.data_pipeline.pipeline_status.schema_id}",
-                blob_name=selected_schema.FileName,
-                module_name=selected_schema.ClassName,
-            ),
+            response_format=response_format,
             max_tokens=4096,
             temperature=0.1,
             top_p=0.1,
@@ -126,7 +134,8 @@ class MapHandler(HandlerBase):
                 }
             )
         )
-        result_file.upload_json_text(
+        await asyncio.to_thread(
+            result_file.upload_json_text,
             account_url=self.application_context.configuration.app_storage_blob_url,
             container_name=self.application_context.configuration.app_cps_processes,
             text=gpt_response.model_dump_json(),
@@ -141,6 +150,111 @@ class MapHandler(HandlerBase):
             },
         )
 
+    def _download_source_file_for_prompt(
+        self, source_file: FileDetails
+    ) -> bytes | None:
+        """
+        Download the source file when it is added to the prompt as images (PDF, JPEG, PNG).
+        """
+        if source_file.mime_type not in [
+            MimeTypes.Pdf,
+            MimeTypes.ImageJpeg,
+            MimeTypes.ImagePng,
+        ]:
+            return None
+
+        return source_file.download_stream(
+            self.application_context.configuration.app_storage_blob_url,
+            self.application_context.configuration.app_cps_processes,
+        )
+
+    async def _resolve_response_format(self, schema_id: str) -> type:
+        """
+        Resolve the schema class in the default executor.
+        Concurrent calls for the same schema_id share a single resolution instead of each
+        reading Cosmos DB and loading the schema from blob storage.
+        """
+        task = self._response_format_inflight.get(schema_id)
+        if task is None:
+            task = asyncio.create_task(
+                asyncio.to_thread(self._get_response_format, schema_id)
+            )
+            self._response_format_inflight[schema_id] = task
+            task.add_done_callback(
+                lambda _: self._response_format_inflight.pop(schema_id, None)
+            )
+
+        # Shield so a cancelled caller does not cancel the resolution for the others
+        return await asyncio.shield(task)
+
+    def _get_response_format(self, schema_id: str) -> type:
+        """
+        Get the schema class for the given schema_id.
+        The schema metadata is read from Cosmos DB on every call, and the class is only
+        loaded from blob storage again when that metadata has changed.
+        """
+        selected_schema = Schema.get_schema(
+            connection_string=self.application_context.configuration.app_cosmos_connstr,
+            database_name=self.application_context.configuration.app_cosmos_database,
+            collection_name=self.application_context.configuration.app_cosmos_container_schema,
+            schema_id=schema_id,
+        )
+
+        # Without a timestamp the metadata can't tell a changed file apart, so always revalidate
+        schema_timestamp = selected_schema.Updated_On or selected_schema.Created_On
+        schema_version = (
+            f"{selected_schema.FileName}:{selected_schema.ClassName}:{schema_timestamp.isoformat()}"
+            if schema_timestamp
+            else None
+        )
+
+        cached = self._response_format_cache.get(schema_id)
+        if schema_version and cached and cached[0] == schema_version:
+            return cached[1]
+
+        response_format = load_schema_from_blob(
+            account_url=self.application_context.configuration.app_storage_blob_url,
+            container_name=f"{self.application_context.configuration.app_cps_configuration}/Schemas/{schema_id}",
+            blob_name=selected_schema.FileName,
+            module_name=selected_schema.ClassName,
+            cache_dir=self.application_context.configuration.app_schema_code_cache_dir,
+        )
+        self._response_format_cache[schema_id] = (schema_version, response_format)
+        return response_format
+
+    def _convert_source_file_to_prompt_images(
+        self, source_file: FileDetails, source_file_bytes: bytes | None
+    ) -> list[dict]:
+        """
+        Convert the source file to image prompts (PDF pages, JPEG, PNG).
+        """
+        # Check file type : PDF
+        if source_file.mime_type == MimeTypes.Pdf:
+            images = []
+            # Convert PDF to multiple images
+            pdf_stream = io.BytesIO(source_file_bytes)
+            # Set the position to the beginning of the stream
+            for image in convert_from_bytes(pdf_stream.read()):
+                byteIO = io.BytesIO()
+                image.save(byteIO, format="PNG")
+                images.append(
+                    self._convert_image_bytes_to_prompt("image/png", byteIO.getvalue())
+                )
+            return images
+        # Check file type : Image - JPEG, PNG
+        elif source_file.mime_type in [
+            MimeTypes.ImageJpeg,
+            MimeTypes.ImagePng,
+        ]:
+            # Extract Images
+            return [
+                self._convert_image_bytes_to_prompt(
+                    source_file.mime_type,
+                    source_file_bytes,
+                )
+            ]
+        return []
+
     def _convert_image_bytes_to_prompt(
         self, mime_string: str, image_stream: bytes
     ) -> list[dict]:
@@ -3,6 +3,7 @@
 
 import datetime
 import json
+import logging
 
 from libs.application.application_context import AppContext
 from libs.models.content_process import ContentProcess, Step_Outputs
@@ -14,12 +15,18 @@ from libs.pipeline.handlers.logics.evaluate_handler.model import DataExtractionR
 from libs.pipeline.queue_handler_base import HandlerBase
 
 
+logger = logging.getLogger(__name__)
+
+
 class SaveHandler(HandlerBase):
     def __init__(self, appContext: AppContext, step_name: str, **data):
         super().__init__(appContext, step_name, **data)
 
     async def execute(self, context: MessageContext) -> StepResult:
-        print(context.data_pipeline.get_previous_step_result(self.handler_name))
+        logger.debug(
+            "Previous step result: %r",
+            context.data_pipeline.get_previous_step_result(self.handler_name),
+        )
 
         # #########################################################
         # # TODO : Save Step Result to Blob Storage
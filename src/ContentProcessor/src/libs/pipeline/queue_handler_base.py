@@ -7,8 +7,10 @@ import datetime
 import json
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 
-from azure.storage.queue import QueueClient
+from azure.storage.queue import QueueClient, QueueMessage
 
 from libs.application.application_context import AppContext
 from libs.base.application_models import AppModelBase
@@ -20,6 +22,16 @@ from libs.pipeline.entities.pipeline_message_context import MessageContext
 from libs.pipeline.entities.pipeline_step_result import StepResult
 from libs.utils import base64_util, stopwatch
 
+# Threads available to handlers for blocking I/O (asyncio.to_thread)
+HANDLER_THREAD_POOL_MAX_WORKERS = 32
+# Queue messages processed concurrently by handlers that await their I/O (a single receive returns at most 32)
+HANDLER_MAX_CONCURRENT_MESSAGES = 16
+
+# Context of the message being processed, local to the asyncio task processing it
+_current_message_context_var: ContextVar[MessageContext | None] = ContextVar(
+    "current_message_context", default=None
+)
+
 
 class HandlerBase(AppModelBase, ABC):
     handler_name: str = None
@@ -28,7 +40,18 @@ class HandlerBase(AppModelBase, ABC):
     application_context: AppContext = None
     dead_letter_queue_client: QueueClient = None
     dead_letter_queue_name: str = None
-    _current_message_context: MessageContext = None
+    # Queue messages processed concurrently. Only raise it for handlers whose execute awaits its blocking I/O:
+    # blocking work holds the event loop, and the other received messages wait while their visibility timeout runs
+    max_concurrent_messages: int = 1
+
+    @property
+    def _current_message_context(self) -> MessageContext | None:
+        # Messages are processed concurrently, so the context is kept per task rather than on the instance
+        return _current_message_context_var.get()
+
+    @_current_message_context.setter
+    def _current_message_context(self, value: MessageContext | None):
+        _current_message_context_var.set(value)
 
     def __init__(self, appContext: AppContext, step_name: str, **data):
         super().__init__(**data)
@@ -42,7 +65,25 @@ class HandlerBase(AppModelBase, ABC):
         # Initialize the handler
         self.__initialize_handler(app_context, step_name)
 
+        # Size the default executor for I/O bound work rather than CPU count
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=HANDLER_THREAD_POOL_MAX_WORKERS)
+        )
+
+        # Messages being processed by this handler
+        in_flight: set[asyncio.Task] = set()
+
+        def _on_message_processed(task: asyncio.Task):
+            in_flight.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logging.error(f"Error Occurred: {task.exception()}")
+
         while True:
+            # Wait for a free slot before fetching more messages
+            if len(in_flight) >= self.max_concurrent_messages:
+                await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
             checking_message: str = """Checking Message.... at {datetime} by {queue_name}
             """
             checking_message = checking_message.format(
@@ -55,12 +96,8 @@ class HandlerBase(AppModelBase, ABC):
 
             logging.info(checking_message) if show_information else None
 
-            # Check if queue is available in the storage account or not
-            pipeline_queue_helper.invalidate_queue(self.queue_client)
-            pipeline_queue_helper.invalidate_queue(self.dead_letter_queue_client)
-
-            # Check if there are any messages in the queue
-            if not pipeline_queue_helper.has_messages(self.queue_client):
+            # Check if there are any messages in the queue - blocking calls, run in the default executor
+            if not await asyncio.to_thread(self._check_queue_has_messages):
                 print(
                     f"No messages found. - {self.queue_name}"
                 ) if show_information else None
@@ -71,340 +108,378 @@ class HandlerBase(AppModelBase, ABC):
                 )
                 continue
 
-            # Process the message
-            for queue_message in self.queue_client.receive_messages(
-                max_messages=1,
-                visibility_timeout=self.application_context.configuration.app_message_queue_process_timeout,
+            # Fetch as many messages as there are free slots in one request and process them concurrently
+            free_slots = self.max_concurrent_messages - len(in_flight)
+            for queue_message in await asyncio.to_thread(
+                self._receive_messages, free_slots
             ):
-                logging.info(
-                    f"Message dequeued {self.queue_name}: {queue_message.content}"
-                ) if show_information else None
+                task = asyncio.create_task(
+                    self._process_message(queue_message, step_name, show_information)
+                )
+                in_flight.add(task)
+                task.add_done_callback(_on_message_processed)
+
+    def _check_queue_has_messages(self) -> bool:
+        # Check if queue is available in the storage account or not
+        pipeline_queue_helper.invalidate_queue(self.queue_client)
+        pipeline_queue_helper.invalidate_queue(self.dead_letter_queue_client)
+
+        return pipeline_queue_helper.has_messages(self.queue_client)
+
+    def _receive_messages(self, max_messages: int) -> list[QueueMessage]:
+        # A single request returns up to max_messages (at most 32)
+        return list(
+            self.queue_client.receive_messages(
+                messages_per_page=max_messages,
+                max_messages=max_messages,
+                visibility_timeout=self.application_context.configuration.app_message_queue_process_timeout,
+            )
+        )
 
-                # Check if the message content is Base64 encoded string
-                if base64_util.is_base64_encoded(queue_message.content):
-                    queue_message.content = base64.b64decode(
-                        queue_message.content
-                    ).decode("utf-8")
+    async def _process_message(
+        self, queue_message: QueueMessage, step_name: str, show_information: bool
+    ):
+        logging.info(
+            f"Message dequeued {self.queue_name}: {queue_message.content}"
+        ) if show_information else None
+
+        # Check if the message content is Base64 encoded string
+        if base64_util.is_base64_encoded(queue_message.content):
+            queue_message.content = base64.b64decode(queue_message.content).decode(
+                "utf-8"
+            )
+
+        data_pipeline: DataPipeline = DataPipeline.get_object(queue_message.content)
+
+        try:
+            if data_pipeline is not None:
+                ########################################################
+                # Pass the message to the implementation of the method #
+                ########################################################
+                print(
+                    f"Message received: {self.handler_name} \n {data_pipeline}"
+                ) if show_information else None
 
-                data_pipeline: DataPipeline = DataPipeline.get_object(
-                    queue_message.content
+                # Set the current message context
+                self._current_message_context = MessageContext(
+                    queue_message=queue_message,
+                    data_pipeline=data_pipeline,
                 )
 
+                # Set Active Step with current handler name
+                self._current_message_context.data_pipeline.pipeline_status.active_step = self.handler_name
+
+                print(
+                    f"Start Processing : {self.handler_name}"
+                ) if show_information else None
+                with stopwatch.Stopwatch() as timer:
+                    # Execute the handler - Check each derived class for the implementation of the execute method
+                    step_result = await self.execute(self._current_message_context)
+                print(
+                    f"Completed : {self.handler_name} - Elapsed :{timer.elapsed_string}"
+                ) if show_information else None
+                step_result.elapsed = timer.elapsed_string
+
                 try:
-                    if data_pipeline is not None:
-                        ########################################################
-                        # Pass the message to the implementation of the method #
-                        ########################################################
-                        print(
-                            f"Message received: {self.handler_name} \n {data_pipeline}"
-                        ) if show_information else None
-
-                        # Set the current message context
-                        self._current_message_context = MessageContext(
-                            queue_message=queue_message,
-                            data_pipeline=data_pipeline,
-                        )
+                    # Save the executed result to persistent - Save the result as a file
+                    await asyncio.to_thread(
+                        step_result.save_to_persistent_storage,
+                        self.application_context.configuration.app_storage_blob_url,
+                        self.application_context.configuration.app_cps_processes,
+                    )
+                finally:
+                    # Wait for the uploads the handler started in background, even when the save failed.
+                    # File details (size, mime type) must be final before the pipeline status is saved and passed on
+                    await step_result.wait_for_pending_tasks()
+
+                # Persist the result and pass the message on - blocking calls, run in the default executor
+                await asyncio.to_thread(
+                    self._complete_message, step_result, queue_message, step_name
+                )
+            else:
+                logging.error("Message is not a valid model.")
+                self._move_to_dead_letter_queue(queue_message)
+        except Exception as e:
+            logging.error(f"Error Occurred: {e}")
+
+            # Record the error and retry or dead letter the message - blocking calls, run in the default executor
+            await asyncio.to_thread(
+                self._handle_message_error, e, queue_message, step_name
+            )
 
-                        # Set Active Step with current handler name
-                        self._current_message_context.data_pipeline.pipeline_status.active_step = self.handler_name
-
-                        print(
-                            f"Start Processing : {self.handler_name}"
-                        ) if show_information else None
-                        with stopwatch.Stopwatch() as timer:
-                            # Execute the handler - Check each derived class for the implementation of the execute method
-                            step_result = await self.execute(
-                                self._current_message_context
-                            )
-                        print(
-                            f"Completed : {self.handler_name} - Elapsed :{timer.elapsed_string}"
-                        ) if show_information else None
-                        step_result.elapsed = timer.elapsed_string
-
-                        # Save the executed result to persistent - Save the result as a file
-                        step_result.save_to_persistent_storage(
-                            self.application_context.configuration.app_storage_blob_url,
-                            self.application_context.configuration.app_cps_processes,
-                        )
+    def _complete_message(
+        self, step_result: StepResult, queue_message: QueueMessage, step_name: str
+    ):
+        # Add result to the pipeline status
+        self._current_message_context.data_pipeline.pipeline_status.add_step_result(
+            step_result
+        )
 
-                        # Add result to the pipeline status
-                        self._current_message_context.data_pipeline.pipeline_status.add_step_result(
-                            step_result
-                        )
+        # Save(update) pipeline status to the persistent storage
+        self._current_message_context.data_pipeline.save_to_persistent_storage(
+            self.application_context.configuration.app_storage_blob_url,
+            self.application_context.configuration.app_cps_processes,
+        )
 
-                        # Save(update) pipeline status to the persistent storage
-                        self._current_message_context.data_pipeline.save_to_persistent_storage(
-                            self.application_context.configuration.app_storage_blob_url,
-                            self.application_context.configuration.app_cps_processes,
-                        )
+        # Enqueue the message to the next step queue
+        pipeline_queue_helper.pass_data_pipeline_to_next_step(
+            self._current_message_context.data_pipeline,
+            self.application_context.configuration.app_storage_queue_url,
+            self.application_context.credential,
+        )
 
-                        # Enqueue the message to the next step queue
-                        pipeline_queue_helper.pass_data_pipeline_to_next_step(
-                            self._current_message_context.data_pipeline,
-                            self.application_context.configuration.app_storage_queue_url,
-                            self.application_context.credential,
-                        )
+        # Delete the message from the current queue
+        pipeline_queue_helper.delete_queue_message(queue_message, self.queue_client)
+
+        # Update Process Status to Cosmos DB
+        # process_id, processed_file_name, status, last_modified_time, last_modified_by update per each every steps.
+        ContentProcess(
+            process_id=self._current_message_context.data_pipeline.pipeline_status.process_id,
+            processed_file_name=self._current_message_context.data_pipeline.files[
+                0
+            ].name,
+            processed_file_mime_type=self._current_message_context.data_pipeline.files[
+                0
+            ].mime_type,
+            status="Completed"
+            if self._current_message_context.data_pipeline.pipeline_status.completed
+            else step_name,
+            imported_time=datetime.datetime.strptime(
+                self._current_message_context.data_pipeline.pipeline_status.creation_time,
+                "%Y-%m-%dT%H:%M:%S.%fZ",
+            ),
+            last_modified_time=datetime.datetime.now(datetime.UTC),
+            last_modified_by=step_name,
+        ).update_process_status_to_cosmos(
+            connection_string=self.application_context.configuration.app_cosmos_connstr,
+            database_name=self.application_context.configuration.app_cosmos_database,
+            collection_name=self.application_context.configuration.app_cosmos_container_process,
+        )
 
-                        # Delete the message from the current queue
-                        pipeline_queue_helper.delete_queue_message(
-                            queue_message, self.queue_client
-                        )
+    def _handle_message_error(
+        self, e: Exception, queue_message: QueueMessage, step_name: str
+    ):
+        def _get_artifact_type(step_name: str) -> ArtifactType:
+            if step_name == "extract":
+                return ArtifactType.ExtractedContent
+            elif step_name == "map":
+                return ArtifactType.SchemaMappedData
+            elif step_name == "evaluate":
+                return ArtifactType.ScoreMergedData
+            else:
+                return ArtifactType.Undefined
+
+        def _find_process_result(step_name: str):
+            return next(
+                (
+                    result
+                    for result in self._current_message_context.data_pipeline.pipeline_status.process_results
+                    if result.step_name == step_name
+                ),
+                None,
+            )
 
-                        # Update Process Status to Cosmos DB
-                        # process_id, processed_file_name, status, last_modified_time, last_modified_by update per each every steps.
-                        ContentProcess(
-                            process_id=self._current_message_context.data_pipeline.pipeline_status.process_id,
-                            processed_file_name=self._current_message_context.data_pipeline.files[
-                                0
-                            ].name,
-                            processed_file_mime_type=self._current_message_context.data_pipeline.files[
-                                0
-                            ].mime_type,
-                            status="Completed"
-                            if self._current_message_context.data_pipeline.pipeline_status.completed
-                            else step_name,
-                            imported_time=datetime.datetime.strptime(
-                                self._current_message_context.data_pipeline.pipeline_status.creation_time,
-                                "%Y-%m-%dT%H:%M:%S.%fZ",
-                            ),
-                            last_modified_time=datetime.datetime.now(datetime.UTC),
-                            last_modified_by=step_name,
-                        ).update_process_status_to_cosmos(
-                            connection_string=self.application_context.configuration.app_cosmos_connstr,
-                            database_name=self.application_context.configuration.app_cosmos_database,
-                            collection_name=self.application_context.configuration.app_cosmos_container_process,
-                        )
-                    else:
-                        logging.error("Message is not a valid model.")
-                        self._move_to_dead_letter_queue(queue_message)
-                except Exception as e:
-                    logging.error(f"Error Occurred: {e}")
-
-                    def _get_artifact_type(step_name: str) -> ArtifactType:
-                        if step_name == "extract":
-                            return ArtifactType.ExtractedContent
-                        elif step_name == "map":
-                            return ArtifactType.SchemaMappedData
-                        elif step_name == "evaluate":
-                            return ArtifactType.ScoreMergedData
-                        else:
-                            return ArtifactType.Undefined
-
-                    def _find_process_result(step_name: str):
-                        return next(
-                            (
-                                result
-                                for result in self._current_message_context.data_pipeline.pipeline_status.process_results
-                                if result.step_name == step_name
-                            ),
-                            None,
-                        )
+        # Save the exception to the status object
+        if self._current_message_context is not None:
+            # Add Exception Information
+            self._current_message_context.data_pipeline.pipeline_status.exception = e
+            # Add the result to the status object
+            exception_result = StepResult(
+                process_id=self._current_message_context.data_pipeline.pipeline_status.process_id,
+                step_name=self.handler_name,
+                result={
+                    "result": "error",
+                    "error": self._current_message_context.data_pipeline.pipeline_status.exception.model_dump_json(),
+                },
+            )
 
-                    # Save the exception to the status object
-                    if self._current_message_context is not None:
-                        # Add Exception Information
-                        self._current_message_context.data_pipeline.pipeline_status.exception = e
-                        # Add the result to the status object
-                        exception_result = StepResult(
-                            process_id=self._current_message_context.data_pipeline.pipeline_status.process_id,
-                            step_name=self.handler_name,
-                            result={
-                                "result": "error",
-                                "error": self._current_message_context.data_pipeline.pipeline_status.exception.model_dump_json(),
-                            },
-                        )
+            # Add the exception result to the pipeline status
+            self._current_message_context.data_pipeline.pipeline_status.add_step_result(
+                exception_result
+            )
 
-                        # Add the exception result to the pipeline status
-                        self._current_message_context.data_pipeline.pipeline_status.add_step_result(
-                            exception_result
-                        )
+            # Save the exception result to the persistent storage
+            exception_result.save_to_persistent_storage(
+                account_url=self.application_context.configuration.app_storage_blob_url,
+                container_name=self.application_context.configuration.app_cps_processes,
+            )
 
-                        # Save the exception result to the persistent storage
-                        exception_result.save_to_persistent_storage(
-                            account_url=self.application_context.configuration.app_storage_blob_url,
-                            container_name=self.application_context.configuration.app_cps_processes,
-                        )
+            # Save the pipeline status to the persistent storage
+            self._current_message_context.data_pipeline.pipeline_status.save_to_persistent_storage(
+                account_url=self.application_context.configuration.app_storage_blob_url,
+                container_name=self.application_context.configuration.app_cps_processes,
+            )
 
-                        # Save the pipeline status to the persistent storage
-                        self._current_message_context.data_pipeline.pipeline_status.save_to_persistent_storage(
-                            account_url=self.application_context.configuration.app_storage_blob_url,
-                            container_name=self.application_context.configuration.app_cps_processes,
-                        )
+            # Update Process Status to Cosmos DB
+            ContentProcess(
+                process_id=self._current_message_context.data_pipeline.process_id,
+                processed_file_name=self._current_message_context.data_pipeline.files[
+                    0
+                ].name,
+                status="Error",
+                processed_file_mime_type=self._current_message_context.data_pipeline.files[
+                    0
+                ].mime_type,
+                last_modified_time=datetime.datetime.now(datetime.UTC),
+                last_modified_by=step_name,
+                imported_time=datetime.datetime.strptime(
+                    self._current_message_context.data_pipeline.pipeline_status.creation_time,
+                    "%Y-%m-%dT%H:%M:%S.%fZ",
+                ),
+                process_output=[
+                    Step_Outputs(
+                        step_name=self.handler_name,
+                        step_result=exception_result.result,
+                    )
+                ],
+            ).update_status_to_cosmos(
+                connection_string=self.application_context.configuration.app_cosmos_connstr,
+                database_name=self.application_context.configuration.app_cosmos_database,
+                collection_name=self.application_context.configuration.app_cosmos_container_process,
+            )
 
-                        # Update Process Status to Cosmos DB
-                        ContentProcess(
-                            process_id=self._current_message_context.data_pipeline.process_id,
-                            processed_file_name=self._current_message_context.data_pipeline.files[
-                                0
-                            ].name,
-                            status="Error",
-                            processed_file_mime_type=self._current_message_context.data_pipeline.files[
-                                0
-                            ].mime_type,
-                            last_modified_time=datetime.datetime.now(datetime.UTC),
-                            last_modified_by=step_name,
-                            imported_time=datetime.datetime.strptime(
-                                self._current_message_context.data_pipeline.pipeline_status.creation_time,
-                                "%Y-%m-%dT%H:%M:%S.%fZ",
-                            ),
-                            process_output=[
-                                Step_Outputs(
-                                    step_name=self.handler_name,
-                                    step_result=exception_result.result,
-                                )
-                            ],
-                        ).update_status_to_cosmos(
-                            connection_string=self.application_context.configuration.app_cosmos_connstr,
-                            database_name=self.application_context.configuration.app_cosmos_database,
-                            collection_name=self.application_context.configuration.app_cosmos_container_process,
-                        )
+            #######################################################################
+            #
+            # Add Process Step Outputs and save to single file - step_outputs.json
+            #
+            #######################################################################
+            # Get Executed Steps
+            # executed_steps = self._current_message_context.data_pipeline.pipeline_status.completed_steps
+            process_outputs: list[Step_Outputs] = []
+
+            # append previous steps to process_outputs
+            # for step in executed_steps:
+            #     if (
+            #         step
+            #         == self._current_message_context.data_pipeline.pipeline_status.active_step
+            #     ):
+            #         continue
+
+            #     output_json_string = (
+            #         self.download_output_file_to_json_string(
+            #             processed_by=step,
+            #             artifact_type=_get_artifact_type(step),
+            #         )
+            #     )
+            #     process_outputs.append(
+            #         Step_Outputs(
+            #             step_name=step,
+            #             processed_time=_find_process_result(step).elapsed,
+            #             step_result=json.loads(output_json_string),
+            #         )
+            #     )
+
+            # When the message is dequeued more than 5 times, move the message to the Dead Letter Queue
+            if queue_message.dequeue_count > 5:
+                logging.info("Message will be moved to the Dead Letter Queue.")
+                dead_letter_result = StepResult(
+                    process_id=self._current_message_context.data_pipeline.pipeline_status.process_id,
+                    step_name=self.handler_name,
+                    result={
+                        "result": "moved to Dead Letter Queue",
+                        "error": self._current_message_context.data_pipeline.pipeline_status.exception.model_dump_json(),
+                    },
+                )
 
-                        #######################################################################
-                        #
-                        # Add Process Step Outputs and save to single file - step_outputs.json
-                        #
-                        #######################################################################
-                        # Get Executed Steps
-                        # executed_steps = self._current_message_context.data_pipeline.pipeline_status.completed_steps
-                        process_outputs: list[Step_Outputs] = []
-
-                        # append previous steps to process_outputs
-                        # for step in executed_steps:
-                        #     if (
-                        #         step
-                        #         == self._current_message_context.data_pipeline.pipeline_status.active_step
-                        #     ):
-                        #         continue
-
-                        #     output_json_string = (
-                        #         self.download_output_file_to_json_string(
-                        #             processed_by=step,
-                        #             artifact_type=_get_artifact_type(step),
-                        #         )
-                        #     )
-                        #     process_outputs.append(
-                        #         Step_Outputs(
-                        #             step_name=step,
-                        #             processed_time=_find_process_result(step).elapsed,
-                        #             step_result=json.loads(output_json_string),
-                        #         )
-                        #     )
-
-                        # When the message is dequeued more than 5 times, move the message to the Dead Letter Queue
-                        if queue_message.dequeue_count > 5:
-                            logging.info(
-                                "Message will be moved to the Dead Letter Queue."
-                            )
-                            dead_letter_result = StepResult(
-                                process_id=self._current_message_context.data_pipeline.pipeline_status.process_id,
-                                step_name=self.handler_name,
-                                result={
-                                    "result": "moved to Dead Letter Queue",
-                                    "error": self._current_message_context.data_pipeline.pipeline_status.exception.model_dump_json(),
-                                },
-                            )
-
-                            # Add the dead letter result to the pipeline status
-                            self._current_message_context.data_pipeline.pipeline_status.add_step_result(
-                                exception_result
-                            )
-
-                            # Save the dead letter result to the persistent storage
-                            dead_letter_result.save_to_persistent_storage(
-                                account_url=self.application_context.configuration.app_storage_blob_url,
-                                container_name=self.application_context.configuration.app_cps_processes,
-                            )
-
-                            self._current_message_context.data_pipeline.pipeline_status.add_step_result(
-                                dead_letter_result
-                            )
-
-                            # Save the pipeline status to the persistent storage
-                            self._current_message_context.data_pipeline.pipeline_status.save_to_persistent_storage(
-                                account_url=self.application_context.configuration.app_storage_blob_url,
-                                container_name=self.application_context.configuration.app_cps_processes,
-                            )
-
-                            # self._move_to_dead_letter_queue(queue_message)
-                            pipeline_queue_helper.move_to_dead_letter_queue(
-                                queue_message,
-                                self.dead_letter_queue_client,
-                                self.queue_client,
-                            )
-
-                            # Update Process Status - Deadletter queue moving - to Cosmos DB
-                            ContentProcess(
-                                process_id=self._current_message_context.data_pipeline.process_id,
-                                processed_file_name=self._current_message_context.data_pipeline.files[
-                                    0
-                                ].name,
-                                processed_file_mime_type=self._current_message_context.data_pipeline.files[
-                                    0
-                                ].mime_type,
-                                status="Error",
-                                last_modified_time=datetime.datetime.now(datetime.UTC),
-                                last_modified_by=step_name,
-                                imported_time=datetime.datetime.strptime(
-                                    self._current_message_context.data_pipeline.pipeline_status.creation_time,
-                                    "%Y-%m-%dT%H:%M:%S.%fZ",
-                                ),
-                                process_output=[
-                                    Step_Outputs(
-                                        step_name=self.handler_name,
-                                        step_result=dead_letter_result.result,
-                                    )
-                                ],
-                            ).update_status_to_cosmos(
-                                connection_string=self.application_context.configuration.app_cosmos_connstr,
-                                database_name=self.application_context.configuration.app_cosmos_database,
-                                collection_name=self.application_context.configuration.app_cosmos_container_process,
-                            )
-
-                            process_outputs.append(
-                                Step_Outputs(
-                                    step_name=self._current_message_context.data_pipeline.pipeline_status.active_step,
-                                    processed_time="error",
-                                    step_result=dead_letter_result,
-                                )
-                            )
-                        else:
-                            # Set visibility timeout to 30 seconds before the message becomes visible again
-                            self.queue_client.update_message(
-                                queue_message,
-                                visibility_timeout=self.application_context.configuration.app_message_queue_visibility_timeout,  # Adjust the timeout as needed
-                            )
-
-                            process_outputs.append(
-                                Step_Outputs(
-                                    step_name=self._current_message_context.data_pipeline.pipeline_status.active_step,
-                                    processed_time="error",
-                                    step_result=exception_result,
-                                )
-                            )
-
-                        # Add Output file
-                        processed_history = self._current_message_context.data_pipeline.add_file(
-                            file_name="step_outputs.json",
-                            artifact_type=_get_artifact_type(
-                                self._current_message_context.data_pipeline.pipeline_status.active_step,
-                            ),
-                        )
-                        processed_history.log_entries.append(
-                            PipelineLogEntry(
-                                **{
-                                    "source": self.handler_name,
-                                    "message": "Process Output has been added. this file should be deserialized to Step_Outputs[]",
-                                }
-                            )
-                        )
+                # Add the dead letter result to the pipeline status
+                self._current_message_context.data_pipeline.pipeline_status.add_step_result(
+                    exception_result
+                )
 
-                        processed_history.upload_json_text(
-                            account_url=self.application_context.configuration.app_storage_blob_url,
-                            container_name=self.application_context.configuration.app_cps_processes,
-                            text=json.dumps(
-                                [step.model_dump() for step in process_outputs]
-                            ),
+                # Save the dead letter result to the persistent storage
+                dead_letter_result.save_to_persistent_storage(
+                    account_url=self.application_context.configuration.app_storage_blob_url,
+                    container_name=self.application_context.configuration.app_cps_processes,
+                )
+
+                self._current_message_context.data_pipeline.pipeline_status.add_step_result(
+                    dead_letter_result
+                )
+
+                # Save the pipeline status to the persistent storage
+                self._current_message_context.data_pipeline.pipeline_status.save_to_persistent_storage(
+                    account_url=self.application_context.configuration.app_storage_blob_url,
+                    container_name=self.application_context.configuration.app_cps_processes,
+                )
+
+                # self._move_to_dead_letter_queue(queue_message)
+                pipeline_queue_helper.move_to_dead_letter_queue(
+                    queue_message,
+                    self.dead_letter_queue_client,
+                    self.queue_client,
+                )
+
+                # Update Process Status - Deadletter queue moving - to Cosmos DB
+                ContentProcess(
+                    process_id=self._current_message_context.data_pipeline.process_id,
+                    processed_file_name=self._current_message_context.data_pipeline.files[
+                        0
+                    ].name,
+                    processed_file_mime_type=self._current_message_context.data_pipeline.files[
+                        0
+                    ].mime_type,
+                    status="Error",
+                    last_modified_time=datetime.datetime.now(datetime.UTC),
+                    last_modified_by=step_name,
+                    imported_time=datetime.datetime.strptime(
+                        self._current_message_context.data_pipeline.pipeline_status.creation_time,
+                        "%Y-%m-%dT%H:%M:%S.%fZ",
+                    ),
+                    process_output=[
+                        Step_Outputs(
+                            step_name=self.handler_name,
+                            step_result=dead_letter_result.result,
                         )
+                    ],
+                ).update_status_to_cosmos(
+                    connection_string=self.application_context.configuration.app_cosmos_connstr,
+                    database_name=self.application_context.configuration.app_cosmos_database,
+                    collection_name=self.application_context.configuration.app_cosmos_container_process,
+                )
+
+                process_outputs.append(
+                    Step_Outputs(
+                        step_name=self._current_message_context.data_pipeline.pipeline_status.active_step,
+                        processed_time="error",
+                        step_result=dead_letter_result,
+                    )
+                )
+            else:
+                # Set visibility timeout to 30 seconds before the message becomes visible again
+                self.queue_client.update_message(
+                    queue_message,
+                    visibility_timeout=self.application_context.configuration.app_message_queue_visibility_timeout,  # Adjust the timeout as needed
+                )
+
+                process_outputs.append(
+                    Step_Outputs(
+                        step_name=self._current_message_context.data_pipeline.pipeline_status.active_step,
+                        processed_time="error",
+                        step_result=exception_result,
+                    )
+                )
+
+            # Add Output file
+            processed_history = self._current_message_context.data_pipeline.add_file(
+                file_name="step_outputs.json",
+                artifact_type=_get_artifact_type(
+                    self._current_message_context.data_pipeline.pipeline_status.active_step,
+                ),
+            )
+            processed_history.log_entries.append(
+                PipelineLogEntry(
+                    **{
+                        "source": self.handler_name,
+                        "message": "Process Output has been added. this file should be deserialized to Step_Outputs[]",
+                    }
+                )
+            )
+
+            processed_history.upload_json_text(
+                account_url=self.application_context.configuration.app_storage_blob_url,
+                container_name=self.application_context.configuration.app_cps_processes,
+                text=json.dumps([step.model_dump() for step in process_outputs]),
+            )
 
     def __initialize_handler(self, appContext: AppContext, step_name: str):
         self.handler_name = step_name
@@ -1,31 +1,139 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import hashlib
 import importlib.util
+import logging
+import marshal
+import os
+import stat
 import sys
 
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotModifiedError
 from helpers.azure_credential_utils import get_azure_credential
 from azure.storage.blob import BlobServiceClient
 
+logger = logging.getLogger(__name__)
+
+# Loaded schema classes keyed by blob location and class name.
+# Each entry is stored as (etag, loaded_class) and revalidated against the blob etag.
+_schema_class_cache: dict[str, tuple[str, type]] = {}
+
+# Compiled schema code persisted across worker restarts, one (etag, code) file per blob.
+# Used when no cache directory is configured (app_schema_code_cache_dir)
+SCHEMA_CODE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cps_cache")
+
 
 def load_schema_from_blob(
-    account_url: str, container_name: str, blob_name: str, module_name: str
+    account_url: str,
+    container_name: str,
+    blob_name: str,
+    module_name: str,
+    cache_dir: str | None = None,
 ):
     """
     Load the schema from a blob in Azure Storage.
+    The loaded class is cached in process and only downloaded and executed again
+    when the blob has changed since it was loaded. The compiled code is also kept on disk,
+    so a restarted worker skips the download and compile while the blob is unchanged.
+    Cached code is only loaded when the directory and file belong to the current user
+    and are not writable by group or others.
+
+    Args:
+        cache_dir (str, optional): Directory for the compiled code. Defaults to SCHEMA_CODE_CACHE_DIR.
     """
-    # Download the blob content
-    blob_content = _download_blob_content(container_name, blob_name, account_url)
+    cache_dir = cache_dir or SCHEMA_CODE_CACHE_DIR
+    cache_key = f"{account_url}/{container_name}/{blob_name}:{module_name}"
+    cached = _schema_class_cache.get(cache_key)
+    # Not loaded in this process yet - a compiled copy may be left from a previous run
+    cached_code = None if cached else _read_cached_code(cache_dir, cache_key)
+
+    # Download the blob content - None if the cached etag is still current
+    known_etag = cached[0] if cached else cached_code[0] if cached_code else None
+    blob_content, etag = _download_blob_content(
+        container_name, blob_name, account_url, known_etag
+    )
+    if blob_content is None and cached:
+        return cached[1]
+
+    if blob_content is None:
+        code = cached_code[1]
+    else:
+        code = compile(blob_content, blob_name, "exec")
+        _write_cached_code(cache_dir, cache_key, etag, code)
 
     # Execute the script content
     module_name = module_name
-    module = _execute_script(blob_content, module_name)
+    module = _execute_script(code, module_name)
 
     loaded_class = getattr(module, module_name)
+    _schema_class_cache[cache_key] = (etag, loaded_class)
     return loaded_class
 
 
-def _download_blob_content(container_name, blob_name, account_url):
+def _get_cached_code_path(cache_dir: str, cache_key: str) -> str:
+    # Bytecode is only valid for the interpreter version that produced it
+    file_name = hashlib.sha256(
+        f"{cache_key}:{sys.implementation.cache_tag}".encode("utf-8")
+    ).hexdigest()
+    return os.path.join(cache_dir, f"{file_name}.pyc")
+
+
+def _is_private(file_stat: os.stat_result, is_type) -> bool:
+    # Code read from the cache is executed, so anyone able to write it could run code in the worker
+    return (
+        is_type(file_stat.st_mode)
+        and file_stat.st_uid == os.getuid()
+        and not file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+def _read_cached_code(cache_dir: str, cache_key: str):
+    if not hasattr(os, "getuid"):
+        # Ownership cannot be verified on this platform
+        return None
+
+    try:
+        if not _is_private(os.lstat(cache_dir), stat.S_ISDIR):
+            logger.warning("Ignoring schema code cache %s - not private", cache_dir)
+            return None
+
+        fd = os.open(
+            _get_cached_code_path(cache_dir, cache_key),
+            os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0),
+        )
+        with os.fdopen(fd, "rb") as cache_file:
+            if not _is_private(os.fstat(cache_file.fileno()), stat.S_ISREG):
+                logger.warning("Ignoring schema code cache file - not private")
+                return None
+            etag, code = marshal.load(cache_file)
+            return etag, code
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_cached_code(cache_dir: str, cache_key: str, etag: str, code):
+    # The cache is best effort - a read-only or full disk only costs a recompile
+    if not hasattr(os, "getuid"):
+        return
+
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        if not _is_private(os.lstat(cache_dir), stat.S_ISDIR):
+            return
+
+        cache_path = _get_cached_code_path(cache_dir, cache_key)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as cache_file:
+            marshal.dump((etag, code), cache_file)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+
+def _download_blob_content(container_name, blob_name, account_url, etag=None):
     # Create the BlobServiceClient object which will be used to create a container client
     credential = get_azure_credential()
     blob_service_client = BlobServiceClient(
@@ -37,14 +145,26 @@ def _download_blob_content(container_name, blob_name, account_url):
         container=container_name, blob=blob_name
     )
 
-    print(f"\nDownloading blob content from \n\t{blob_name}")
+    logger.debug("Downloading blob content from %s", blob_name)
 
     # Download the blob content as a string
-    blob_content = blob_client.download_blob().readall().decode("utf-8")
-    return blob_content
+    # With an etag, the service answers 304 Not Modified when the blob is unchanged
+    try:
+        if etag:
+            downloader = blob_client.download_blob(
+                etag=etag, match_condition=MatchConditions.IfModified
+            )
+        else:
+            downloader = blob_client.download_blob()
+    except ResourceNotModifiedError:
+        return None, etag
+
+    blob_content = downloader.readall().decode("utf-8")
+    return blob_content, downloader.properties.etag
 
 
 def _execute_script(script_content, module_name):
+    # script_content can be source text or a compiled code object
     # Create a new module
     spec = importlib.util.spec_from_loader(module_name, loader=None)
     module = importlib.util.module_from_spec(spec)
@@ -7,6 +7,7 @@ import sys
 
 from helpers.azure_credential_utils import get_azure_credential
 
+from libs.azure_helper.content_understanding import AzureContentUnderstandingHelper
 from libs.base.application_main import AppMainBase
 from libs.process_host import handler_type_loader
 from libs.process_host.handler_process_host import HandlerHostManager
@@ -31,6 +32,13 @@ class Application(AppMainBase):
         # Add Azure Credential
         self.application_context.set_credential(get_azure_credential())
 
+        # Share one Content Understanding client (and its connection pool) across messages
+        self.application_context.set_content_understanding_helper(
+            AzureContentUnderstandingHelper(
+                self.application_context.configuration.app_content_understanding_endpoint
+            )
+        )
+
     async def run(self, test_mode: bool = False):
         # Get Process lists from the configuration - ex. ["extract", "transform", "evaluate", "save", "custom1", "custom2"....]
         steps = self.application_context.configuration.app_process_steps
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+# Ensure Azure credentials are mocked before any imports
+with patch("helpers.azure_credential_utils.get_azure_credential") as mock_cred:
+    mock_cred.return_value = MagicMock()
+    from libs.azure_helper.content_understanding import (
+        AzureContentUnderstandingHelper,
+    )
+
+
+@pytest.fixture
+def mock_requests(mocker):
+    """Mock the pooled session used by AzureContentUnderstandingHelper."""
+    return mocker.patch(
+        "libs.azure_helper.content_understanding.requests.Session"
+    ).return_value
+
+
+@pytest.fixture
+def content_understanding_helper(mocker, mock_requests):
+    mock_credential = MagicMock()
+    mock_credential.get_token.return_value.expires_on = time.time() + 3600
+    mocker.patch(
+        "libs.azure_helper.content_understanding.get_azure_credential",
+        return_value=mock_credential,
+    )
+    return AzureContentUnderstandingHelper(endpoint="https://example.com/")
+
+
+def _poll_response(status, headers=None):
+    response = MagicMock()
+    response.json.return_value = {"status": status}
+    response.headers = headers or {}
+    return response
+
+
+@pytest.mark.asyncio
+async def test_poll_result_backs_off_exponentially(
+    content_understanding_helper, mock_requests, mocker
+):
+    mock_sleep = mocker.patch(
+        "libs.azure_helper.content_understanding.asyncio.sleep",
+        new_callable=mocker.AsyncMock,
+    )
+    mock_requests.get.side_effect = [
+        _poll_response("running"),
+        _poll_response("running"),
+        _poll_response("running", {"retry-after": "5"}),
+        _poll_response("succeeded"),
+    ]
+    initial_response = _poll_response(
+        "running", {"operation-location": "https://example.com/operation"}
+    )
+
+    result = await content_understanding_helper.poll_result(
+        initial_response, polling_interval_seconds=1
+    )
+
+    assert result == {"status": "succeeded"}
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [1, 2, 5.0]
+
+
+@pytest.mark.asyncio
+async def test_poll_result_failed(content_understanding_helper, mock_requests, mocker):
+    mocker.patch(
+        "libs.azure_helper.content_understanding.asyncio.sleep",
+        new_callable=mocker.AsyncMock,
+    )
+    mock_requests.get.return_value = _poll_response("failed")
+    initial_response = _poll_response(
+        "running", {"operation-location": "https://example.com/operation"}
+    )
+
+    with pytest.raises(RuntimeError):
+        await content_understanding_helper.poll_result(initial_response)
+
+
+def test_access_token_is_reused_until_expiry(
+    content_understanding_helper, mock_requests
+):
+    content_understanding_helper.get_all_analyzers()
+    content_understanding_helper.get_all_analyzers()
+
+    assert content_understanding_helper.credential.get_token.call_count == 1
+
+    content_understanding_helper._access_token.expires_on = time.time()
+    content_understanding_helper.get_all_analyzers()
+
+    assert content_understanding_helper.credential.get_token.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_poll_result_renews_token_in_worker_thread(
+    content_understanding_helper, mock_requests, mocker
+):
+    event_loop_thread = threading.get_ident()
+    token_threads = []
+    credential = content_understanding_helper.credential
+
+    def _get_token(scope):
+        token_threads.append(threading.get_ident())
+        return mocker.MagicMock(token="token", expires_on=time.time() + 3600)
+
+    credential.get_token.side_effect = _get_token
+    mock_requests.get.return_value = _poll_response("succeeded")
+    initial_response = _poll_response(
+        "running", {"operation-location": "https://example.com/operation"}
+    )
+
+    await content_understanding_helper.poll_result(initial_response)
+
+    assert token_threads and event_loop_thread not in token_threads
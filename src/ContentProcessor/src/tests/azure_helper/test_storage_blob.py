@@ -5,7 +5,10 @@ from unittest.mock import MagicMock, patch
 # Ensure Azure credentials are mocked before any imports
 with patch("helpers.azure_credential_utils.get_azure_credential") as mock_cred:
     mock_cred.return_value = MagicMock()
-    from libs.azure_helper.storage_blob import StorageBlobHelper
+    from libs.azure_helper.storage_blob import (
+        BLOB_DOWNLOAD_CHUNK_SIZE,
+        StorageBlobHelper,
+    )
 
 
 @pytest.fixture
@@ -23,6 +26,16 @@ def storage_blob_helper(mock_blob_service_client):
     )
 
 
+def test_blob_service_client_downloads_in_chunks(
+    storage_blob_helper, mock_blob_service_client
+):
+    # The first GET is sized like the others, so download_chunks streams instead of buffering the file
+    assert BLOB_DOWNLOAD_CHUNK_SIZE == 4 * 1024 * 1024
+    kwargs = mock_blob_service_client.call_args.kwargs
+    assert kwargs["max_single_get_size"] == BLOB_DOWNLOAD_CHUNK_SIZE
+    assert kwargs["max_chunk_get_size"] == BLOB_DOWNLOAD_CHUNK_SIZE
+
+
 def test_get_container_client_with_parent_container(
     storage_blob_helper, mock_blob_service_client, mocker
 ):
@@ -115,6 +128,21 @@ def test_download_stream(storage_blob_helper, mock_blob_service_client, mocker):
     assert stream == b"test data"
 
 
+def test_download_chunks(storage_blob_helper, mock_blob_service_client, mocker):
+    mock_blob_client = mocker.MagicMock()
+    mock_blob_service_client.return_value.get_container_client.return_value.get_blob_client.return_value = (
+        mock_blob_client
+    )
+    mock_blob_client.download_blob.return_value.chunks.return_value = iter(
+        [b"test ", b"data"]
+    )
+
+    chunks = storage_blob_helper.download_chunks("testcontainer", "testblob")
+
+    assert b"".join(chunks) == b"test data"
+    mock_blob_client.download_blob.return_value.readall.assert_not_called()
+
+
 def test_download_text(storage_blob_helper, mock_blob_service_client, mocker):
     mock_blob_client = mocker.MagicMock()
     mock_blob_service_client.return_value.get_container_client.return_value.get_blob_client.return_value = (
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from libs.pipeline.entities.pipeline_step_result import StepResult
+
+
+@pytest.mark.asyncio
+async def test_wait_for_pending_tasks():
+    completed = []
+
+    async def upload():
+        completed.append("uploaded")
+
+    step_result = StepResult(process_id="1234", step_name="extract")
+    step_result.add_pending_task(asyncio.create_task(upload()))
+
+    await step_result.wait_for_pending_tasks()
+
+    assert completed == ["uploaded"]
+    assert "_pending_tasks" not in step_result.model_dump_json()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_pending_tasks_raises_error():
+    async def upload():
+        raise RuntimeError("upload failed")
+
+    step_result = StepResult(process_id="1234", step_name="extract")
+    step_result.add_pending_task(asyncio.create_task(upload()))
+
+    with pytest.raises(RuntimeError):
+        await step_result.wait_for_pending_tasks()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_pending_tasks_awaits_all_tasks_on_error():
+    completed = []
+
+    async def failed_upload():
+        raise RuntimeError("upload failed")
+
+    async def slow_upload():
+        await asyncio.sleep(0.01)
+        completed.append("uploaded")
+
+    step_result = StepResult(process_id="1234", step_name="extract")
+    step_result.add_pending_task(asyncio.create_task(failed_upload()))
+    step_result.add_pending_task(asyncio.create_task(slow_upload()))
+
+    with pytest.raises(RuntimeError):
+        await step_result.wait_for_pending_tasks()
+
+    assert completed == ["uploaded"]
@@ -0,0 +1,91 @@
+import asyncio
+import datetime
+
+import pytest
+from unittest.mock import MagicMock
+from libs.application.application_context import AppContext
+from libs.pipeline.entities.mime_types import MimeTypes
+from libs.pipeline.entities.schema import Schema
+from libs.pipeline.handlers.map_handler import MapHandler
+
+
+@pytest.fixture
+def map_handler():
+    handler = MapHandler(appContext=MagicMock(), step_name="map")
+    handler.application_context = MagicMock(spec=AppContext)
+    handler.application_context.configuration = MagicMock()
+    return handler
+
+
+def _schema(updated_on=None):
+    return Schema(
+        Id="schema-1",
+        ClassName="SampleSchema",
+        Description="Sample",
+        FileName="sample.py",
+        ContentType="text/x-python",
+        Created_On=datetime.datetime(2025, 1, 1),
+        Updated_On=updated_on,
+    )
+
+
+def test_get_response_format_uses_cache(map_handler, mocker):
+    mocker.patch.object(Schema, "get_schema", return_value=_schema())
+    mock_loader = mocker.patch(
+        "libs.pipeline.handlers.map_handler.load_schema_from_blob",
+        return_value=object,
+    )
+
+    map_handler._get_response_format("schema-1")
+    map_handler._get_response_format("schema-1")
+
+    assert mock_loader.call_count == 1
+
+
+def test_get_response_format_reloads_updated_schema(map_handler, mocker):
+    mocker.patch.object(
+        Schema,
+        "get_schema",
+        side_effect=[_schema(), _schema(datetime.datetime(2025, 2, 1))],
+    )
+    mock_loader = mocker.patch(
+        "libs.pipeline.handlers.map_handler.load_schema_from_blob",
+        return_value=object,
+    )
+
+    map_handler._get_response_format("schema-1")
+    map_handler._get_response_format("schema-1")
+
+    assert mock_loader.call_count == 2
+
+
+def test_download_source_file_for_prompt_skips_other_types(map_handler):
+    source_file = MagicMock()
+    source_file.mime_type = "application/json"
+
+    assert map_handler._download_source_file_for_prompt(source_file) is None
+    source_file.download_stream.assert_not_called()
+
+
+def test_download_source_file_for_prompt_pdf(map_handler):
+    source_file = MagicMock()
+    source_file.mime_type = MimeTypes.Pdf
+    source_file.download_stream.return_value = b"%PDF"
+
+    assert map_handler._download_source_file_for_prompt(source_file) == b"%PDF"
+
+
+@pytest.mark.asyncio
+async def test_resolve_response_format_coalesces_concurrent_calls(map_handler, mocker):
+    mock_get_response_format = mocker.patch.object(
+        MapHandler, "_get_response_format", return_value=object
+    )
+
+    results = await asyncio.gather(
+        map_handler._resolve_response_format("schema-1"),
+        map_handler._resolve_response_format("schema-1"),
+    )
+
+    assert results == [object, object]
+    assert mock_get_response_format.call_count == 1
+    assert map_handler._response_format_inflight == {}
@@ -1,9 +1,15 @@
+import asyncio
+import threading
+
 import pytest
 from unittest.mock import MagicMock
 from azure.storage.queue import QueueClient
 from libs.pipeline.entities.pipeline_message_context import MessageContext
 from libs.pipeline.entities.pipeline_step_result import StepResult
-from libs.pipeline.queue_handler_base import HandlerBase
+from libs.pipeline.queue_handler_base import (
+    HANDLER_MAX_CONCURRENT_MESSAGES,
+    HandlerBase,
+)
 from libs.application.application_context import AppContext
 
 
@@ -75,3 +81,109 @@ def test_show_queue_information(mock_queue_helper, mock_app_context):
     handler.queue_client = mock_queue_client
 
     handler._show_queue_information()
+
+
+@pytest.mark.asyncio
+async def test_current_message_context_is_task_local():
+    handler = MockHandler(appContext=MagicMock(), step_name="extract")
+    contexts = [MagicMock(spec=MessageContext), MagicMock(spec=MessageContext)]
+
+    async def _set_and_read(context):
+        handler._current_message_context = context
+        await asyncio.sleep(0)
+        return handler._current_message_context
+
+    results = await asyncio.gather(*(_set_and_read(context) for context in contexts))
+
+    assert results == contexts
+    assert handler._current_message_context is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "max_concurrent_messages, received_messages",
+    [(None, 1), (HANDLER_MAX_CONCURRENT_MESSAGES, 2)],
+)
+async def test_connect_async_receives_up_to_max_concurrent_messages(
+    mocker, mock_app_context, max_concurrent_messages, received_messages
+):
+    handler_data = (
+        {"max_concurrent_messages": max_concurrent_messages}
+        if max_concurrent_messages
+        else {}
+    )
+    handler = MockHandler(
+        appContext=mock_app_context, step_name="extract", **handler_data
+    )
+    handler.queue_client = MagicMock(spec=QueueClient)
+    handler.queue_client.receive_messages.return_value = [
+        MagicMock() for _ in range(received_messages)
+    ]
+    mocker.patch.object(handler, "_HandlerBase__initialize_handler")
+    # Keep the shared test event loop's default executor
+    mocker.patch.object(asyncio.get_running_loop(), "set_default_executor")
+    mocker.patch("libs.pipeline.pipeline_queue_helper.invalidate_queue")
+    # Stop the polling loop on the second check
+    mocker.patch(
+        "libs.pipeline.pipeline_queue_helper.has_messages",
+        side_effect=[True, asyncio.CancelledError()],
+    )
+    mock_process_message = mocker.patch.object(
+        handler, "_process_message", new_callable=mocker.AsyncMock
+    )
+    handler.application_context = mock_app_context
+
+    with pytest.raises(asyncio.CancelledError):
+        await handler._connect_async(
+            show_information=False, app_context=mock_app_context, step_name="extract"
+        )
+
+    # Handlers process one message at a time unless they opt in
+    expected_max_messages = max_concurrent_messages or 1
+    handler.queue_client.receive_messages.assert_called_once_with(
+        messages_per_page=expected_max_messages,
+        max_messages=expected_max_messages,
+        visibility_timeout=mock_app_context.configuration.app_message_queue_process_timeout,
+    )
+    assert mock_process_message.await_count == received_messages
+
+
+class FailingMockHandler(HandlerBase):
+    async def execute(self, context: MessageContext) -> StepResult:
+        raise RuntimeError("execute failed")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "handler_class, blocking_method",
+    [
+        (MockHandler, "_complete_message"),
+        (FailingMockHandler, "_handle_message_error"),
+    ],
+)
+async def test_process_message_runs_blocking_calls_off_event_loop(
+    mocker, mock_app_context, handler_class, blocking_method
+):
+    handler = handler_class(appContext=mock_app_context, step_name="extract")
+    handler.application_context = mock_app_context
+    mocker.patch(
+        "libs.pipeline.queue_handler_base.base64_util.is_base64_encoded",
+        return_value=False,
+    )
+    mocker.patch("libs.pipeline.queue_handler_base.DataPipeline.get_object")
+    mocker.patch("libs.pipeline.queue_handler_base.MessageContext")
+    mocker.patch.object(StepResult, "save_to_persistent_storage")
+
+    event_loop_thread = threading.get_ident()
+    blocking_threads = []
+    mocker.patch.object(
+        handler,
+        blocking_method,
+        side_effect=lambda *args: blocking_threads.append(threading.get_ident()),
+    )
+
+    await handler._process_message(
+        MagicMock(), step_name="extract", show_information=False
+    )
+
+    assert blocking_threads and event_loop_thread not in blocking_threads
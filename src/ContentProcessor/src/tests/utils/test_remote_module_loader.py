@@ -0,0 +1,115 @@
+import pytest
+from azure.core.exceptions import ResourceNotModifiedError
+from libs.utils import remote_module_loader
+from libs.utils.remote_module_loader import load_schema_from_blob
+
+SCHEMA_SOURCE = b"""
+from pydantic import BaseModel
+
+
+class SampleSchema(BaseModel):
+    name: str
+"""
+
+
+@pytest.fixture
+def mock_blob_client(mocker, tmp_path):
+    remote_module_loader._schema_class_cache.clear()
+    mocker.patch.object(remote_module_loader, "SCHEMA_CODE_CACHE_DIR", str(tmp_path))
+    mocker.patch("libs.utils.remote_module_loader.get_azure_credential")
+    mock_service_client = mocker.patch(
+        "libs.utils.remote_module_loader.BlobServiceClient"
+    )
+    return mock_service_client.return_value.get_blob_client.return_value
+
+
+def test_load_schema_from_blob(mock_blob_client):
+    mock_blob_client.download_blob.return_value.readall.return_value = SCHEMA_SOURCE
+    mock_blob_client.download_blob.return_value.properties.etag = "etag-1"
+
+    loaded_class = load_schema_from_blob(
+        "https://example.com", "schemas", "sample.py", "SampleSchema"
+    )
+
+    assert loaded_class.__name__ == "SampleSchema"
+    assert loaded_class(name="test").name == "test"
+
+
+def test_load_schema_from_blob_not_modified(mock_blob_client):
+    mock_blob_client.download_blob.return_value.readall.return_value = SCHEMA_SOURCE
+    mock_blob_client.download_blob.return_value.properties.etag = "etag-1"
+
+    first = load_schema_from_blob(
+        "https://example.com", "schemas", "sample.py", "SampleSchema"
+    )
+
+    mock_blob_client.download_blob.side_effect = ResourceNotModifiedError()
+    second = load_schema_from_blob(
+        "https://example.com", "schemas", "sample.py", "SampleSchema"
+    )
+
+    assert first is second
+    assert mock_blob_client.download_blob.call_args.kwargs["etag"] == "etag-1"
+
+
+def test_load_schema_from_blob_uses_compiled_code_cache(mock_blob_client, mocker):
+    mock_blob_client.download_blob.return_value.readall.return_value = SCHEMA_SOURCE
+    mock_blob_client.download_blob.return_value.properties.etag = "etag-1"
+
+    load_schema_from_blob("https://example.com", "schemas", "sample.py", "SampleSchema")
+
+    # Simulate a worker restart - the in-process cache is gone, the disk cache is not
+    remote_module_loader._schema_class_cache.clear()
+    mock_blob_client.download_blob.side_effect = ResourceNotModifiedError()
+    mock_compile = mocker.patch("builtins.compile")
+
+    loaded_class = load_schema_from_blob(
+        "https://example.com", "schemas", "sample.py", "SampleSchema"
+    )
+
+    assert loaded_class(name="test").name == "test"
+    assert mock_blob_client.download_blob.call_args.kwargs["etag"] == "etag-1"
+    mock_compile.assert_not_called()
+
+
+@pytest.mark.parametrize("writable", ["directory", "file"])
+def test_load_schema_from_blob_ignores_writable_code_cache(
+    mock_blob_client, mocker, tmp_path, writable
+):
+    mock_blob_client.download_blob.return_value.readall.return_value = SCHEMA_SOURCE
+    mock_blob_client.download_blob.return_value.properties.etag = "etag-1"
+
+    load_schema_from_blob("https://example.com", "schemas", "sample.py", "SampleSchema")
+
+    # Someone else could have replaced the compiled code
+    cache_file = next(tmp_path.glob("*.pyc"))
+    (tmp_path if writable == "directory" else cache_file).chmod(
+        0o777 if writable == "directory" else 0o666
+    )
+    remote_module_loader._schema_class_cache.clear()
+    mock_compile = mocker.patch("builtins.compile", wraps=compile)
+
+    loaded_class = load_schema_from_blob(
+        "https://example.com", "schemas", "sample.py", "SampleSchema"
+    )
+
+    assert loaded_class(name="test").name == "test"
+    assert "etag" not in mock_blob_client.download_blob.call_args.kwargs
+    mock_compile.assert_called_once()
+
+
+def test_load_schema_from_blob_uses_configured_cache_dir(mock_blob_client, tmp_path):
+    mock_blob_client.download_blob.return_value.readall.return_value = SCHEMA_SOURCE
+    mock_blob_client.download_blob.return_value.properties.etag = "etag-1"
+    cache_dir = tmp_path / "configured"
+
+    load_schema_from_blob(
+        "https://example.com",
+        "schemas",
+        "sample.py",
+        "SampleSchema",
+        cache_dir=str(cache_dir),
+    )
+
+    assert len(list(cache_dir.glob("*.pyc"))) == 1
+    assert oct(cache_dir.stat().st_mode & 0o777) == oct(0o700)
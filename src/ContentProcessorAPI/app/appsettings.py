@@ -3,6 +3,7 @@
 
 import logging
 import os
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -33,28 +34,32 @@ class AppConfiguration(ModelBaseSettings):
     app_logging_level: str
 
 
-# Read .env file
 # Get Current Path + .env file
 env_file_path = os.path.join(os.path.dirname(__file__), ".env")
-load_dotenv(env_file_path)
 
-# Get App Configuration
-env_config = EnvConfiguration()
-app_helper = AppConfigurationHelper(env_config.app_config_endpoint)
-app_helper.read_and_set_environmental_variables()
 
-app_config = AppConfiguration()
-
-if app_config.app_logging_enable:
-    # Read Configuration for Logging Level as a Text then retrive the logging level
-    logging_level = getattr(
-        logging, app_config.app_logging_level
-    )
-    logging.basicConfig(level=logging_level)
-else:
-    logging.disable(logging.CRITICAL)
+def _configure_logging(app_config: AppConfiguration):
+    if app_config.app_logging_enable:
+        # Read Configuration for Logging Level as a Text then retrive the logging level
+        logging_level = getattr(
+            logging, app_config.app_logging_level
+        )
+        logging.basicConfig(level=logging_level)
+    else:
+        logging.disable(logging.CRITICAL)
 
 
 # Dependency Function
+@lru_cache(maxsize=1)
 def get_app_config() -> AppConfiguration:
+    # Read .env file and App Configuration only once, on first use
+    load_dotenv(env_file_path)
+
+    # Get App Configuration
+    env_config = EnvConfiguration()
+    app_helper = AppConfigurationHelper(env_config.app_config_endpoint)
+    app_helper.read_and_set_environmental_variables()
+
+    app_config = AppConfiguration()
+    _configure_logging(app_config)
     return app_config
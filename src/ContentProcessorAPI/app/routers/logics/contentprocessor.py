@@ -1,6 +1,8 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+from functools import lru_cache
+
 from pydantic import BaseModel, Field
 
 from app.appsettings import AppConfiguration, get_app_config
@@ -33,8 +35,7 @@ class ContentProcessor(BaseModel):
         arbitrary_types_allowed = True
 
 
-coontent_processor = ContentProcessor()
-
-
+# Created on first use, not at import, so importing the routers does not read App Configuration or open clients
+@lru_cache(maxsize=1)
 def get_content_processor() -> ContentProcessor:
-    return coontent_processor
+    return ContentProcessor()
@@ -1,6 +1,8 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+from functools import lru_cache
+
 from fastapi import UploadFile
 from pydantic import BaseModel, Field
 
@@ -114,8 +116,7 @@ class Schemas(BaseModel):
         arbitrary_types_allowed = True
 
 
-schemas = Schemas()
-
-
+# Created on first use, not at import, so importing the routers does not read App Configuration or open clients
+@lru_cache(maxsize=1)
 def get_schemas() -> Schemas:
-    return schemas
+    return Schemas()
@@ -1,10 +1,68 @@
 from __future__ import annotations
 
-import json
-from datetime import datetime
+import functools
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Numeric fields rendered as fixed two-decimal strings by to_dict()
+ITEM_DECIMAL_FIELDS = ("unit_price", "total_price", "net_weight", "gross_weight")
+INVOICE_DECIMAL_FIELDS = ("net_value", "total_value", "total_net_weight", "total_gross_weight")
+# Nullable column types used when converting invoice items to a DataFrame
+ITEM_COLUMN_DTYPES = {
+    "quantity": "Int64",
+    "unit_price": "Float64",
+    "total_price": "Float64",
+    "net_weight": "Float64",
+    "gross_weight": "Float64",
+    "is_dangerous_goods": "boolean",
+}
+
+
+def format_decimal_fields(data: dict, fields: tuple[str, ...]) -> dict:
+    """
+    Formats the given numeric fields of a dumped model as two-decimal strings, in place.
+
+    Args:
+        data: The dictionary produced by model_dump.
+        fields: The names of the fields to format.
+
+    Returns:
+        dict: The same dictionary with the fields formatted.
+    """
+    data.update({field: f"{data[field]:.2f}" for field in fields if data[field] is not None})
+    return data
+
+
+@functools.cache
+def _empty_invoice_address() -> InvoiceAddress:
+    return InvoiceAddress(
+        company_name="",
+        street="",
+        city="",
+        postal_code="",
+        state="",
+        country=""
+    )
+
+
+@functools.cache
+def _empty_invoice_item() -> InvoiceItem:
+    return InvoiceItem(
+        item_description="",
+        part_number="",
+        eu_hts_no="",
+        country_of_origin="",
+        quantity=0,
+        unit_price=0.0,
+        total_price=0.0,
+        net_weight=0.0,
+        gross_weight=0.0,
+        currency="",
+        is_dangerous_goods=False,
+        un_number="",
+        dangerous_goods_class="",
+    )
 
 
 class InvoiceAddress(BaseModel):
@@ -20,29 +78,25 @@ class InvoiceAddress(BaseModel):
         country: Country name
     """
 
-    company_name: Optional[str] = Field(description="Name of the company, e.g. BC Distribution B.V.")
-    street: Optional[str] = Field(description="Street address, e.g. Pelmolenlaan 15")
-    city: Optional[str] = Field(description="City name, e.g. Woerden")
-    postal_code: Optional[str] = Field(description="Postal code, e.g. 3447 GW")
-    state: Optional[str] = Field(description="State or region, e.g. North Holland")
-    country: Optional[str] = Field(description="Country name, e.g. Netherlands")
+    model_config = ConfigDict(frozen=True)
+
+    company_name: Optional[str] = Field(default=None, description="Name of the company, e.g. BC Distribution B.V.")
+    street: Optional[str] = Field(default=None, description="Street address, e.g. Pelmolenlaan 15")
+    city: Optional[str] = Field(default=None, description="City name, e.g. Woerden")
+    postal_code: Optional[str] = Field(default=None, description="Postal code, e.g. 3447 GW")
+    state: Optional[str] = Field(default=None, description="State or region, e.g. North Holland")
+    country: Optional[str] = Field(default=None, description="Country name, e.g. Netherlands")
 
     @staticmethod
     def example():
         """
-        Creates an empty example InvoiceAddress object.
+        Returns the empty example InvoiceAddress object.
+        The object is frozen, so a single cached instance is shared by all callers.
 
         Returns:
             InvoiceAddress: An empty InvoiceAddress object.
         """
-        return InvoiceAddress(
-            company_name="",
-            street="",
-            city="",
-            postal_code="",
-            state="",
-            country=""
-        )
+        return _empty_invoice_address()
 
     def to_dict(self):
         """
@@ -51,14 +105,7 @@ class InvoiceAddress(BaseModel):
         Returns:
             dict: The InvoiceAddress object as a dictionary.
         """
-        return {
-            "company_name": self.company_name,
-            "street": self.street,
-            "city": self.city,
-            "postal_code": self.postal_code,
-            "state": self.state,
-            "country": self.country,
-        }
+        return self.model_dump(mode="json")
 
 
 class InvoiceItem(BaseModel):
@@ -81,37 +128,51 @@ class InvoiceItem(BaseModel):
         dangerous_goods_class: UN dangerous goods classification
     """
 
+    model_config = ConfigDict(frozen=True)
+
     item_description: Optional[str] = Field(
+        default=None,
         description="Details of the goods including product, size, and lot information, e.g. Cleaning Solution, 6 x 450 mL, LOT: 2820"
     )
     part_number: Optional[str] = Field(
+        default=None,
         description="Unique identifier for the product, e.g. 66039"
     )
     eu_hts_no: Optional[str] = Field(
+        default=None,
         description="EU Harmonized Tariff Schedule code, e.g. 34029010"
     )
     country_of_origin: Optional[str] = Field(
+        default=None,
         description="Country code where goods were manufactured, e.g. IE"
     )
     quantity: Optional[int] = Field(
+        default=None,
         description="Number of units shipped, e.g. 1"
     )
     unit_price: Optional[float] = Field(
+        default=None,
         description="Price per unit, e.g. 100336.00"
     )
     total_price: Optional[float] = Field(
+        default=None,
         description="Total price for this item, e.g. 100336.00"
     )
     net_weight: Optional[float] = Field(
+        default=None,
         description="Weight of goods excluding packaging in KG, e.g. 3.50"
     )
     gross_weight: Optional[float] = Field(
+        default=None,
         description="Total weight including packaging in KG, e.g. 25.0"
     )
     currency: Optional[str] = Field(
+        default=None,
         description="Currency code, e.g. KRW, USD, EUR"
     )
+    # Factory defaults are not emitted in the JSON schema, so the response_format sent to OpenAI is unchanged
     is_dangerous_goods: Optional[bool] = Field(
+        default_factory=bool,
         description=(
             "Indicates if the item is classified as dangerous goods by UN standards. "
             "First, try to determine this from extracted data (item description, part number, HTS code). "
@@ -120,6 +181,7 @@ class InvoiceItem(BaseModel):
         )
     )
     un_number: Optional[str] = Field(
+        default=None,
         description=(
             "UN identification number for dangerous goods, e.g. UN1203. "
             "First, try to extract it from the document (item description, part number, HTS code, or other identifiers). "
@@ -127,6 +189,7 @@ class InvoiceItem(BaseModel):
         )
     )
     dangerous_goods_class: Optional[str] = Field(
+        default=None,
         description=(
             "UN dangerous goods classification, e.g. Class 3 - Flammable liquids. "
             "First, try to extract it from the document. "
@@ -136,49 +199,26 @@ class InvoiceItem(BaseModel):
     @staticmethod
     def example():
         """
-        Creates an empty example InvoiceItem object.
+        Returns the empty example InvoiceItem object.
+        The object is frozen, so a single cached instance is shared by all callers.
 
         Returns:
             InvoiceItem: An empty InvoiceItem object.
         """
-        return InvoiceItem(
-            item_description="",
-            part_number="",
-            eu_hts_no="",
-            country_of_origin="",
-            quantity=0,
-            unit_price=0.0,
-            total_price=0.0,
-            net_weight=0.0,
-            gross_weight=0.0,
-            currency="",
-            is_dangerous_goods=False,
-            un_number="",
-            dangerous_goods_class="",
-        )
+        return _empty_invoice_item()
 
-    def to_dict(self):
+    def to_dict(self, formatted: bool = True):
         """
         Converts the InvoiceItem object to a dictionary.
 
+        Args:
+            formatted: Render prices and weights as two-decimal strings. When False they are kept as numbers.
+
         Returns:
             dict: The InvoiceItem object as a dictionary.
         """
-        return {
-            "item_description": self.item_description,
-            "part_number": self.part_number,
-            "eu_hts_no": self.eu_hts_no,
-            "country_of_origin": self.country_of_origin,
-            "quantity": self.quantity,
-            "unit_price": f"{self.unit_price:.2f}" if self.unit_price is not None else None,
-            "total_price": f"{self.total_price:.2f}" if self.total_price is not None else None,
-            "net_weight": f"{self.net_weight:.2f}" if self.net_weight is not None else None,
-            "gross_weight": f"{self.gross_weight:.2f}" if self.gross_weight is not None else None,
-            "currency": self.currency,
-            "is_dangerous_goods": self.is_dangerous_goods,
-            "un_number": self.un_number,
-            "dangerous_goods_class": self.dangerous_goods_class,
-        }
+        data = self.model_dump(mode="json")
+        return format_decimal_fields(data, ITEM_DECIMAL_FIELDS) if formatted else data
 
 
 class EXPDCommercialInvoice(BaseModel):
@@ -206,66 +246,89 @@ class EXPDCommercialInvoice(BaseModel):
         total_gross_weight: Total gross weight of all items
     """
 
+    model_config = ConfigDict(frozen=True)
+
     seller_exporter: Optional[InvoiceAddress] = Field(
+        default=None,
         description="Company responsible for selling and exporting the goods"
     )
     seller_exporter_vat: Optional[str] = Field(
+        default=None,
         description="VAT identification number for EU tax purposes, e.g. NL 850641469B02"
     )
     ship_to: Optional[InvoiceAddress] = Field(
+        default=None,
         description="Consignee or final recipient of the goods"
     )
     invoice_number: Optional[str] = Field(
+        default=None,
         description="Unique identifier assigned to the invoice, e.g. 2431998448"
     )
     invoice_date: Optional[str] = Field(
+        default=None,
         description="Date when the invoice was issued, e.g. 17-Jun-2025"
     )
     customer_number: Optional[str] = Field(
+        default=None,
         description="Internal reference number for the buyer, e.g. 88682"
     )
     ship_to_site_number: Optional[str] = Field(
+        default=None,
         description="Identifier of the destination site, e.g. 736400"
     )
     ship_method: Optional[str] = Field(
+        default=None,
         description="Mode of transport used to ship goods, e.g. NEF-AIR"
     )
     terms_of_delivery: Optional[str] = Field(
+        default=None,
         description="Incoterm defining delivery responsibilities, e.g. DPU (Delivered at Place Unloaded)"
     )
     payment_terms: Optional[str] = Field(
+        default=None,
         description="Payment conditions, e.g. IMMEDIATE"
     )
     stop_id: Optional[str] = Field(
+        default=None,
         description="Logistics reference for shipment stop, e.g. STP0107326"
     )
     items: Optional[list[InvoiceItem]] = Field(
+        default_factory=list,
         description="List of items included in the invoice"
     )
     number_of_boxes: Optional[int] = Field(
+        default=None,
         description="Total number of packages in shipment, e.g. 1"
     )
     net_value: Optional[float] = Field(
+        default=None,
         description="Value of goods excluding additional charges"
     )
     total_value: Optional[float] = Field(
+        default=None,
         description="Final invoice value including all charges"
     )
     currency: Optional[str] = Field(
+        default=None,
         description="Primary currency for the invoice, e.g. KRW, USD, EUR"
     )
     total_net_weight: Optional[float] = Field(
+        default=None,
         description="Total net weight of all items in KG"
     )
     total_gross_weight: Optional[float] = Field(
+        default=None,
         description="Total gross weight of all items in KG"
     )
 
     @staticmethod
-    def example():
+    def example(invoice_date: str = ""):
         """
         Creates an empty example EXPDCommercialInvoice object.
 
+        Args:
+            invoice_date: The invoice date to use, e.g. 17-Jun-2025. Empty by default so the example is deterministic.
+
         Returns:
             EXPDCommercialInvoice: An empty EXPDCommercialInvoice object.
         """
@@ -274,7 +337,7 @@ class EXPDCommercialInvoice(BaseModel):
             seller_exporter_vat="",
             ship_to=InvoiceAddress.example(),
             invoice_number="",
-            invoice_date=datetime.now().strftime("%d-%b-%Y"),
+            invoice_date=invoice_date,
             customer_number="",
             ship_to_site_number="",
             ship_method="",
@@ -291,103 +354,70 @@ class EXPDCommercialInvoice(BaseModel):
         )
 
     @staticmethod
-    def from_json(json_str: str):
+    def from_json(json_str: str | bytes):
         """
         Creates an EXPDCommercialInvoice object from a JSON string.
+        The JSON is parsed and validated in a single pass by pydantic-core.
 
         Args:
-            json_str: The JSON string representing the EXPDCommercialInvoice object.
+            json_str: The JSON string or UTF-8 encoded bytes representing the EXPDCommercialInvoice object.
 
         Returns:
             EXPDCommercialInvoice: An EXPDCommercialInvoice object.
         """
-        json_content = json.loads(json_str)
-
-        def create_invoice_address(address_data):
-            if address_data is None:
-                return None
-            return InvoiceAddress(
-                company_name=address_data.get("company_name", None),
-                street=address_data.get("street", None),
-                city=address_data.get("city", None),
-                postal_code=address_data.get("postal_code", None),
-                state=address_data.get("state", None),
-                country=address_data.get("country", None),
-            )
-
-        def create_invoice_item(item_data):
-            if item_data is None:
-                return None
-            return InvoiceItem(
-                item_description=item_data.get("item_description", None),
-                part_number=item_data.get("part_number", None),
-                eu_hts_no=item_data.get("eu_hts_no", None),
-                country_of_origin=item_data.get("country_of_origin", None),
-                quantity=item_data.get("quantity", None),
-                unit_price=item_data.get("unit_price", None),
-                total_price=item_data.get("total_price", None),
-                net_weight=item_data.get("net_weight", None),
-                gross_weight=item_data.get("gross_weight", None),
-                currency=item_data.get("currency", None),
-                is_dangerous_goods=item_data.get("is_dangerous_goods", False),
-                un_number=item_data.get("un_number", None),
-                dangerous_goods_class=item_data.get("dangerous_goods_class", None),
-            )
-
-        items_list = [
-            create_invoice_item(item) for item in json_content.get("items", [])
-        ]
+        return EXPDCommercialInvoice.model_validate_json(json_str)
 
-        return EXPDCommercialInvoice(
-            seller_exporter=create_invoice_address(json_content.get("seller_exporter", None)),
-            seller_exporter_vat=json_content.get("seller_exporter_vat", None),
-            ship_to=create_invoice_address(json_content.get("ship_to", None)),
-            invoice_number=json_content.get("invoice_number", None),
-            invoice_date=json_content.get("invoice_date", None),
-            customer_number=json_content.get("customer_number", None),
-            ship_to_site_number=json_content.get("ship_to_site_number", None),
-            ship_method=json_content.get("ship_method", None),
-            terms_of_delivery=json_content.get("terms_of_delivery", None),
-            payment_terms=json_content.get("payment_terms", None),
-            stop_id=json_content.get("stop_id", None),
-            items=items_list,
-            number_of_boxes=json_content.get("number_of_boxes", None),
-            net_value=json_content.get("net_value", None),
-            total_value=json_content.get("total_value", None),
-            currency=json_content.get("currency", None),
-            total_net_weight=json_content.get("total_net_weight", None),
-            total_gross_weight=json_content.get("total_gross_weight", None),
-        )
+    def items_to_dataframe(self):
+        """
+        Converts the invoice items to a columnar pandas DataFrame, one column per item field.
+        Numeric columns use nullable dtypes so sums and filters run vectorized over missing values.
 
-    def to_dict(self):
+        Returns:
+            pandas.DataFrame: The invoice items, one row per item.
+        """
+        return EXPDCommercialInvoice.items_to_dataframe_batch([self])
+
+    @staticmethod
+    def items_to_dataframe_batch(invoices: list[EXPDCommercialInvoice]):
+        """
+        Converts the items of many invoices to a single columnar pandas DataFrame.
+
+        Args:
+            invoices: The EXPDCommercialInvoice objects to convert.
+
+        Returns:
+            pandas.DataFrame: The items of all invoices, with an invoice_number column identifying the invoice.
+        """
+        # Imported here so loading the schema does not require pandas
+        import pandas as pd
+
+        item_fields = list(InvoiceItem.model_fields)
+        columns = {"invoice_number": [], **{field: [] for field in item_fields}}
+        for invoice in invoices:
+            for item in invoice.items or []:
+                columns["invoice_number"].append(invoice.invoice_number)
+                for field in item_fields:
+                    columns[field].append(getattr(item, field))
+
+        return pd.DataFrame(columns).astype(ITEM_COLUMN_DTYPES)
+
+    def to_dict(self, formatted: bool = True):
         """
         Converts the EXPDCommercialInvoice object to a dictionary.
 
+        Args:
+            formatted: Render values and weights as two-decimal strings. When False they are kept as numbers,
+                which skips the per-field string formatting and leaves display formatting to the caller.
+
         Returns:
             dict: The EXPDCommercialInvoice object as a dictionary.
         """
-        def to_list(items, expected_type):
-            return [item.to_dict() for item in items if isinstance(item, expected_type)]
-
-        items_list = to_list(self.items or [], InvoiceItem)
-
-        return {
-            "seller_exporter": self.seller_exporter.to_dict() if self.seller_exporter is not None else None,
-            "seller_exporter_vat": self.seller_exporter_vat,
-            "ship_to": self.ship_to.to_dict() if self.ship_to is not None else None,
-            "invoice_number": self.invoice_number,
-            "invoice_date": self.invoice_date,
-            "customer_number": self.customer_number,
-            "ship_to_site_number": self.ship_to_site_number,
-            "ship_method": self.ship_method,
-            "terms_of_delivery": self.terms_of_delivery,
-            "payment_terms": self.payment_terms,
-            "stop_id": self.stop_id,
-            "items": items_list,
-            "number_of_boxes": self.number_of_boxes,
-            "net_value": f"{self.net_value:.2f}" if self.net_value is not None else None,
-            "total_value": f"{self.total_value:.2f}" if self.total_value is not None else None,
-            "currency": self.currency,
-            "total_net_weight": f"{self.total_net_weight:.2f}" if self.total_net_weight is not None else None,
-            "total_gross_weight": f"{self.total_gross_weight:.2f}" if self.total_gross_weight is not None else None,
-        }
+        data = self.model_dump(mode="json")
+        data["items"] = data["items"] or []
+        if not formatted:
+            return data
+
+        format_decimal_fields(data, INVOICE_DECIMAL_FIELDS)
+        for item in data["items"]:
+            format_decimal_fields(item, ITEM_DECIMAL_FIELDS)
+        return data